@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compact binary format of result for merging results of sharded runs.
+File is magic bytes, version of format and major version of python
+as plain bytes, header and records of suites. Header and records are
+dumped by marshal, so file can be read suite by suite. Format of
+marshal is not the same between python 2 and 3, so version of python
+is checked before the first of them is loaded.
+"""
+
+import sys
+import struct
+import marshal
+import logging
+
+from . import runnable
+from .xunit import XUnitData
+from .exceptions import BinaryResultError
+
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'SGRESULT'
+VERSIONS = struct.Struct('BB')
+FORMAT_VERSION = 2
+
+
+def pack_storage(storage):
+    return [
+        (
+            repr(runnable_object),
+            runnable.class_name(runnable_object),
+            runnable.method_name(runnable_object),
+            runnable.stopped_on(runnable_object),
+            xunit_data.to_dict(),
+        )
+        for runnable_object, xunit_data in storage
+    ]
+
+
+def unpack_storage(packed_storage):
+    for obj_repr, class_name, method_name, stopped_on, dct in packed_storage:
+        runnable_object = runnable.RunnableHandle.restore(
+            obj_repr, class_name, method_name, stopped_on,
+        )
+        yield runnable_object, XUnitData.from_dict(dct)
+
+
+def pack_proxy(result_proxy):
+    return (
+        result_proxy.name,
+        result_proxy.get_state().runtime,
+        pack_storage(result_proxy.successes),
+        pack_storage(result_proxy.skipped),
+        pack_storage(result_proxy.failures),
+        pack_storage(result_proxy.errors),
+    )
+
+
+def write_result(result, file_path):
+    logger.debug(
+        'Write binary result to "{}"'.format(file_path),
+    )
+
+    proxies = result.proxies or [result]
+
+    with open(file_path, 'wb') as fp:
+        fp.write(MAGIC)
+        fp.write(VERSIONS.pack(FORMAT_VERSION, sys.version_info[0]))
+        marshal.dump(
+            {
+                'name': result.name,
+                'runtime': result.get_state().runtime,
+                'suites': [result_proxy.name for result_proxy in proxies],
+            },
+            fp,
+        )
+
+        for result_proxy in proxies:
+            marshal.dump(pack_proxy(result_proxy), fp)
+
+
+def read_header(fp):
+    if fp.read(len(MAGIC)) != MAGIC:
+        raise BinaryResultError(
+            '"{}" is not binary result'.format(fp.name),
+        )
+
+    versions = fp.read(VERSIONS.size)
+
+    if len(versions) != VERSIONS.size:
+        raise BinaryResultError(
+            'Binary result "{}" is broken'.format(fp.name),
+        )
+
+    version, python = VERSIONS.unpack(versions)
+
+    if version != FORMAT_VERSION:
+        raise BinaryResultError(
+            'Unsupported version of binary result "{}"'.format(fp.name),
+        )
+
+    if python != sys.version_info[0]:
+        raise BinaryResultError(
+            'Binary result "{}" was written by python {}'.format(
+                fp.name, python,
+            ),
+        )
+
+    try:
+        header = marshal.load(fp)
+    except (EOFError, ValueError, TypeError):
+        raise BinaryResultError(
+            'Header of binary result "{}" is broken'.format(fp.name),
+        )
+
+    header.update(version=version, python=python)
+
+    return header
+
+
+def read_result_header(file_path):
+    with open(file_path, 'rb') as fp:
+        return read_header(fp)
+
+
+def iter_records(fp):
+    while True:
+        try:
+            yield marshal.load(fp)
+        except EOFError:
+            break
+
+
+def read_result(file_path):
+    """
+    Header and generator of records of suites.
+    Records are read from file one by one.
+    """
+    fp = open(file_path, 'rb')
+
+    try:
+        header = read_header(fp)
+    except BaseException:
+        fp.close()
+        raise
+
+    def records():
+        with fp:
+            for record in iter_records(fp):
+                yield record
+
+    return header, records()
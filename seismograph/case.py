@@ -13,6 +13,7 @@ from . import loader
 from . import reason
 from . import runnable
 from .utils import pyv
+from . import fixtures
 from . import extensions
 from .utils import common
 from .exceptions import Skip
@@ -61,6 +62,24 @@ def prepare(case, method):
     return case.__prepare__(method)
 
 
+def get_case_class(case):
+    if isinstance(case, CaseDescriptor):
+        return case.cls
+    return case.__class__
+
+
+def get_require_key(case_class):
+    """
+    Names of extensions which are required by case class
+    """
+    require = set(case_class.__require__ or [])
+
+    if case_class.__mount_data__ and case_class.__mount_data__.require:
+        require.update(case_class.__mount_data__.require)
+
+    return tuple(sorted(require))
+
+
 def setup_class_proxy(case):
     if getattr(case.__class__, '__setup_class_was_called__', False):
         return
@@ -75,6 +94,13 @@ def teardown_class_proxy(case):
     setattr(case.__class__, '__teardown_class_was_called__', True)
 
 
+def reset_class_proxies(case):
+    case_class = get_case_class(case)
+
+    setattr(case_class, '__setup_class_was_called__', False)
+    setattr(case_class, '__teardown_class_was_called__', False)
+
+
 def _skip(reason):
     def wrapper(case):
         if not pyv.is_class_type(case):
@@ -121,6 +147,7 @@ def flows(*flows):
     def wrapper(f):
         if pyv.is_class_type(f):
             setattr(f, '__flows__', flows)
+            loader.reset_class_metadata(f)
             return f
 
         @wraps(f)
@@ -137,11 +164,13 @@ def flows(*flows):
 
 
 def apply_flows(case):
-    if not steps.is_step_by_step_case(case) and case.__flows__:
+    case_flows = loader.get_class_metadata(case.__class__).flows
+
+    if not steps.is_step_by_step_case(case) and case_flows:
         setattr(
             case.__class__,
             runnable.method_name(case),
-            flows(*case.__flows__)(
+            flows(*case_flows)(
                 getattr(case.__class__, runnable.method_name(case)),
             ),
         )
@@ -186,7 +215,7 @@ def with_match_layers(context, case):
 class CaseBox(object):
 
     def __init__(self, iterable):
-        self.__cases = iterable
+        self.__cases = list(iterable)
         self.__current = None
 
         logger.debug('CaseBox was created')
@@ -219,8 +248,44 @@ class CaseBox(object):
         else:
             self.__current(result)
 
+    def __materialize__(self, descriptor, result):
+        """
+        Instance of lazy case is created right before its run.
+        Error of creation is added to result as error of case,
+        so other cases of box are running.
+        """
+        timer = measure_time()
+
+        try:
+            return descriptor.materialize()
+        except ALLOW_RAISED_EXCEPTIONS:
+            raise
+        except BaseException as error:
+            runnable.set_debug_if_allowed(descriptor.config)
+            tb = traceback.format_exc()
+
+            with result.proxy() as result_proxy:
+                result_proxy.start(descriptor)
+                result_proxy.add_error(
+                    descriptor, tb, timer(), error,
+                )
+
+        return None
+
     def __run__(self, result):
-        for case in self.__cases:
+        previous = None
+
+        for index, case in enumerate(self.__cases):
+            if isinstance(case, CaseDescriptor):
+                case = self.__materialize__(case, result)
+
+                if case is None:
+                    continue
+
+            if previous is not None:
+                self.__release__(previous)
+
+            previous = index
             self.__current = case
             try:
                 setup_class_proxy(self.__current)
@@ -229,13 +294,105 @@ class CaseBox(object):
                 raise error
             self.__run_current__(result)
 
-        if self.__current:
+        if previous is not None:
             try:
                 teardown_class_proxy(self.__current)
             except BaseException as error:
                 runnable.stopped_on(self.__current, 'teardown_class')
                 raise error
 
+            self.__release__(previous)
+
+    def __release__(self, index):
+        """
+        Current case is finished and it's released right after run,
+        so it's not living until end of box. In compact mode it's
+        replaced by handle, lazy case is staying as descriptor.
+        """
+        config = self.__current.config
+
+        if config.COMPACT_RESULT:
+            self.__cases[index] = runnable.handle(self.__current)
+
+        if config.COMPACT_RESULT or config.LAZY_CASES:
+            self.__current = runnable.handle(self.__current)
+
+
+class CaseDescriptor(object):
+    """
+    Light description of case which is built instead of
+    case instance. Instance is created by box right before
+    run of case and it's not kept in box after that.
+    """
+
+    __slots__ = (
+        '__id',
+        '__cls',
+        '__config',
+        '__stopped_on',
+        '__method_name',
+    )
+
+    __create_reason__ = False
+
+    def __init__(self, cls, method_name, config=None):
+        self.__cls = cls
+        self.__config = config
+        self.__id = runnable.new_id()
+        self.__stopped_on = method_name
+        self.__method_name = method_name
+
+    def __str__(self):
+        return '{} ({}:{})'.format(
+            self.__method_name,
+            self.__cls.__mount_data__.suite_name,
+            self.__cls.__name__,
+        )
+
+    def __repr__(self):
+        class_path = '{}:{}'.format(
+            self.__cls.__mount_data__.suite_name, self.__cls.__name__,
+        )
+        return '<{} method_name={} stopped_on={}>'.format(
+            class_path, self.__method_name, self.__stopped_on,
+        )
+
+    @property
+    def id(self):
+        return self.__id
+
+    @property
+    def cls(self):
+        return self.__cls
+
+    @property
+    def config(self):
+        return self.__config
+
+    @property
+    def _stopped_on(self):
+        return self.__stopped_on
+
+    @_stopped_on.setter
+    def _stopped_on(self, value):
+        self.__stopped_on = value
+
+    def __method_name__(self):
+        return self.__method_name
+
+    def __stopped_on__(self):
+        return self.__stopped_on
+
+    def __class_name__(self):
+        return '{}.{}'.format(
+            self.__cls.__mount_data__.suite_name, self.__cls.__name__,
+        )
+
+    def materialize(self):
+        case = self.__cls(self.__method_name, config=self.__config)
+        case.id = self.__id
+        return case
+
 
 class MountData(object):
 
@@ -541,6 +698,7 @@ class CaseContext(runnable.ContextOfRunnableObject):
                  layers=None):
         self.__require = []
         self.__extensions = {}
+        self.__fixtures = fixtures.FixtureScope(fixtures.CASE)
         self.__layers = layers if layers else []
 
         self.__setup_callbacks = [setup]
@@ -554,6 +712,10 @@ class CaseContext(runnable.ContextOfRunnableObject):
     def extensions(self):
         return self.__extensions
 
+    @property
+    def fixtures(self):
+        return self.__fixtures
+
     @property
     def setup_callbacks(self):
         return self.__setup_callbacks
@@ -606,6 +768,9 @@ class CaseContext(runnable.ContextOfRunnableObject):
 
     def install_extensions(self):
         for ext_name in self.require:
+            if fixtures.is_fixture(ext_name):
+                # fixtures are created on request
+                continue
             if ext_name not in self.__extensions:
                 self.__extensions[ext_name] = extensions.get(ext_name)
 
@@ -819,7 +984,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         if result.current_state.should_stop:
             return
 
-        with result.proxy() as result_proxy:
+        with result.proxy() as result_proxy, result_proxy.capture_log():
             result_proxy.start(self)
 
             if self.__always_success__:
@@ -845,7 +1010,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
                 was_success = True
 
                 for _ in iter(repeat(self)):
-                    with self.__context(self):
+                    with self.__context.fixtures, self.__context(self):
                         try:
                             test_method = prepare(
                                 self, getattr(self, runnable.method_name(self)),
@@ -1054,6 +1219,13 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         if name not in self.__context.require:
             raise ExtensionNotRequired(name)
 
+        if fixtures.is_fixture(name):
+            return fixtures.get(
+                name,
+                suite_name=self.__mount_data__.suite_name,
+                case_scope=self.__context.fixtures,
+            )
+
         return self.__context.extensions.get(name)
 
     @runnable.run_method
@@ -4,7 +4,7 @@ import logging
 from random import Random
 
 from . import loader
-from . import extensions
+from . import schedule
 from .suite import BuildRule
 from .exceptions import CollectError
 from .utils.common import call_to_chain
@@ -20,6 +20,53 @@ def get_shuffle(config):
     return None
 
 
+def get_runtimes(config):
+    if config.RUNTIMES_FROM:
+        return schedule.load_runtimes(config.RUNTIMES_FROM)
+    return None
+
+
+def get_scheduler(runtimes):
+    if runtimes is not None:
+        return schedule.longest_first(runtimes)
+    return None
+
+
+def get_failed_first(config):
+    if config.FAILED_FIRST:
+        from .lastfailed import get_cache_path
+        from .lastfailed import LastFailedCache
+
+        cache = LastFailedCache(get_cache_path(config))
+        return schedule.failed_first(cache.suite_names(), cache.keys())
+    return None
+
+
+def get_order(config, runtimes=None):
+    stages = [
+        stage for stage in (
+            get_shuffle(config),
+            get_scheduler(runtimes),
+            get_failed_first(config),
+        )
+        if stage
+    ]
+
+    if len(stages) > 1:
+        def order(lst):
+            for stage in stages:
+                stage(lst)
+        return order
+
+    return stages[0] if stages else None
+
+
+def get_shard_weight(runtimes):
+    if runtimes is not None:
+        return schedule.runtime_weight(runtimes)
+    return schedule.count_weight
+
+
 def get_suite_name_from_command(command):
     try:
         suite_name, _ = command.split(':')
@@ -62,7 +109,6 @@ def try_apply_rules(suite, rules):
 
 def base_generator(suites, shuffle=None):
     call_to_chain(suites, 'build', shuffle=shuffle)
-    extensions.clear()
 
     if shuffle:
         shuffle(suites)
@@ -89,7 +135,6 @@ def generator_by_commands(suites, rules, shuffle=None):
         )
 
     call_to_chain(loaded_suites, 'build', shuffle=shuffle)
-    extensions.clear()
 
     if shuffle:
         shuffle(loaded_suites)
@@ -98,7 +143,72 @@ def generator_by_commands(suites, rules, shuffle=None):
         yield suite
 
 
+def shard_suites(suites, config, runtimes=None):
+    weight = get_shard_weight(runtimes)
+
+    partitions = schedule.partition(
+        suites,
+        config.SHARD_COUNT,
+        weight=weight,
+        key=lambda s: s.name,
+    )
+    shard = partitions[config.SHARD_INDEX]
+
+    return [s for s in suites if s in shard]
+
+
+def shard_cases(suites, config, runtimes=None):
+    weight = get_shard_weight(runtimes)
+
+    partitions = schedule.partition(
+        [(s, b) for s in suites for b in s],
+        config.SHARD_COUNT,
+        weight=lambda item: weight(item[1]),
+        key=lambda item: schedule.box_key(item[1]),
+    )
+    shard = set(id(b) for _, b in partitions[config.SHARD_INDEX])
+
+    for suite in suites:
+        suite.filter_cases(lambda b: id(b) in shard)
+
+    return [s for s in suites if s]
+
+
+def shard_generator(generator, config, runtimes=None):
+    """
+    Only one partition of suites is running. Partitions are stable
+    and independent of random order, so each of machines can
+    run its own part by index without any coordination.
+    """
+    suites = list(generator)
+
+    logger.debug(
+        'Take shard {} of {} from {} suites'.format(
+            config.SHARD_INDEX, config.SHARD_COUNT, len(suites),
+        ),
+    )
+
+    if config.SHARD_CASES:
+        suites = shard_cases(suites, config, runtimes=runtimes)
+    else:
+        suites = shard_suites(suites, config, runtimes=runtimes)
+
+    for suite in suites:
+        yield suite
+
+
 def create_generator(suites, config):
+    # runtimes are loaded once for order and for weight of shards
+    runtimes = get_runtimes(config)
+    generator = create_base_generator(suites, config, runtimes=runtimes)
+
+    if config.SHARD_COUNT:
+        return shard_generator(generator, config, runtimes=runtimes)
+
+    return generator
+
+
+def create_base_generator(suites, config, runtimes=None):
     if config.TESTS:
         logger.debug('Create suite generator by commands')
 
@@ -111,11 +221,11 @@ def create_generator(suites, config):
             for c in config.TESTS
         ]
         return generator_by_commands(
-            suites, rules, shuffle=get_shuffle(config),
+            suites, rules, shuffle=get_order(config, runtimes=runtimes),
         )
 
     logger.debug('Create base suite generator')
 
     return base_generator(
-        suites, shuffle=get_shuffle(config),
+        suites, shuffle=get_order(config, runtimes=runtimes),
     )
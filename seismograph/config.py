@@ -26,6 +26,45 @@ def create_option_parser():
         default=None,
         help='Path to xml file to store the xunit report in.',
     )
+    result_group.add_option(
+        '--xunit-stream',
+        dest='XUNIT_STREAM',
+        action='store_true',
+        default=False,
+        help='Write xunit report suite by suite while tests are running.',
+    )
+    result_group.add_option(
+        '--binary-report',
+        dest='BINARY_REPORT',
+        default=None,
+        help='Path to file to store result in binary format for merging.',
+    )
+    result_group.add_option(
+        '--timings-db',
+        dest='TIMINGS_DB',
+        default=None,
+        help='Path to sqlite database for saving history of runtimes.',
+    )
+    result_group.add_option(
+        '--compact-result',
+        dest='COMPACT_RESULT',
+        action='store_true',
+        default=False,
+        help='Keep light records in result instead of finished cases.',
+    )
+    result_group.add_option(
+        '--reason-spill-size',
+        dest='REASON_SPILL_SIZE',
+        type=int,
+        default=None,
+        help='Reasons bigger than this count of chars are kept in temp file.',
+    )
+    result_group.add_option(
+        '--events',
+        dest='EVENTS',
+        default=None,
+        help='Path to file or "unix:<path>" of socket for json lines of run events.',
+    )
     parser.add_option_group(result_group)
 
     console_group = OptionGroup(parser, 'Output options')
@@ -50,6 +89,13 @@ def create_option_parser():
         default=False,
         help='No capture log.',
     )
+    console_group.add_option(
+        '--log-capture-size',
+        dest='LOG_CAPTURE_SIZE',
+        type=int,
+        default=1000,
+        help='Count of last log records to keep for case.',
+    )
     console_group.add_option(
         '--suite-detail',
         action='store_true',
@@ -71,6 +117,13 @@ def create_option_parser():
         default=False,
         help='No use color on output.',
     )
+    console_group.add_option(
+        '--buffered-console',
+        dest='BUFFERED_CONSOLE',
+        action='store_true',
+        default=False,
+        help='Write output from separate thread by large chunks.',
+    )
     parser.add_option_group(console_group)
 
     case_group = OptionGroup(parser, 'Case options')
@@ -105,6 +158,26 @@ def create_option_parser():
         default=[],
         help='Run these tests.',
     )
+    run_group.add_option(
+        '--discovery-cache',
+        dest='DISCOVERY_CACHE',
+        default=None,
+        help='Path to index of suites by modules for loading needed modules only.',
+    )
+    run_group.add_option(
+        '--lazy-cases',
+        dest='LAZY_CASES',
+        action='store_true',
+        default=False,
+        help='Create instance of case right before its run.',
+    )
+    run_group.add_option(
+        '--group-fixtures',
+        dest='GROUP_FIXTURES',
+        action='store_true',
+        default=False,
+        help='Run cases of one class together and classes with the same requirements one by one.',
+    )
     run_group.add_option(
         '--include-regexp',
         dest='INCLUDE_SUITES_PATTERN',
@@ -153,6 +226,54 @@ def create_option_parser():
         default=time.time(),
         help='Seed for random tests and suites.',
     )
+    run_group.add_option(
+        '--runtimes-from',
+        dest='RUNTIMES_FROM',
+        default=None,
+        help='Path to xunit report or timings database of previous runs. '
+             'Longest suites and cases will be running first.',
+    )
+    run_group.add_option(
+        '--last-failed',
+        dest='LAST_FAILED',
+        action='store_true',
+        default=False,
+        help='Rerun failed tests of last run only, all tests if nothing was failed.',
+    )
+    run_group.add_option(
+        '--failed-first',
+        dest='FAILED_FIRST',
+        action='store_true',
+        default=False,
+        help='Run failed tests of last run first and all other tests after them.',
+    )
+    run_group.add_option(
+        '--last-failed-cache',
+        dest='LAST_FAILED_CACHE',
+        default=None,
+        help='Path to cache of failed tests for "--last-failed" and "--failed-first".',
+    )
+    run_group.add_option(
+        '--shard-count',
+        dest='SHARD_COUNT',
+        type=int,
+        default=None,
+        help='Count of shards to split suites to. Use with "--shard-index".',
+    )
+    run_group.add_option(
+        '--shard-index',
+        dest='SHARD_INDEX',
+        type=int,
+        default=None,
+        help='Index of shard for running from 0 to shard count - 1.',
+    )
+    run_group.add_option(
+        '--shard-cases',
+        dest='SHARD_CASES',
+        action='store_true',
+        default=False,
+        help='Split cases of suites to shards instead of whole suites.',
+    )
     run_group.add_option(
         '--no-skip',
         dest='NO_SKIP',
@@ -202,6 +323,27 @@ def create_option_parser():
         default=float(1800),
         help='Timeout to release and join multiprocessing process.',
     )
+    run_group.add_option(
+        '--mp-pool',
+        dest='MULTIPROCESSING_POOL',
+        action='store_true',
+        default=False,
+        help='Use persistent pool of worker processes for multiprocessing run.',
+    )
+    run_group.add_option(
+        '--mp-stream',
+        dest='MULTIPROCESSING_STREAM',
+        action='store_true',
+        default=False,
+        help='Stream result of each case from worker pool to main process.',
+    )
+    run_group.add_option(
+        '--mp-split-cases',
+        dest='MULTIPROCESSING_SPLIT_CASES',
+        action='store_true',
+        default=False,
+        help='Split cases of each suite between processes of worker pool.',
+    )
     run_group.add_option(
         '--gevent',
         dest='GEVENT',
@@ -253,6 +395,30 @@ def prepare_config(config):
             config.ASYNC_SUITES or config.ASYNC_TESTS):
         config.MULTIPROCESSING = True
 
+    if config.MULTIPROCESSING_STREAM or config.MULTIPROCESSING_SPLIT_CASES:
+        config.MULTIPROCESSING_POOL = True
+
+    if config.MULTIPROCESSING_POOL:
+        config.MULTIPROCESSING = True
+
+    if config.SHARD_COUNT is not None or config.SHARD_INDEX is not None:
+        if config.SHARD_COUNT is None or config.SHARD_INDEX is None:
+            raise ConfigError(
+                'shard count and shard index should be used together',
+            )
+
+        if config.SHARD_COUNT < 1:
+            raise ConfigError(
+                'shard count should be greater than 0',
+            )
+
+        if not 0 <= config.SHARD_INDEX < config.SHARD_COUNT:
+            raise ConfigError(
+                'shard index should be from 0 to {}'.format(
+                    config.SHARD_COUNT - 1,
+                ),
+            )
+
     if (config.STEPS_LOG or config.FLOWS_LOG) and not config.VERBOSE:
         config.VERBOSE = True
 
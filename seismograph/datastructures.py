@@ -1,5 +1,14 @@
 # coding: utf-8
 
+from decimal import Decimal
+from fractions import Fraction
+from collections import defaultdict
+from datetime import date, time, timedelta
+from types import FunctionType, BuiltinFunctionType
+
+from .utils import pyv
+from .exceptions import FreezeError
+
 
 class DictObject(dict):
 
@@ -32,3 +41,218 @@ class DictObject(dict):
 
 class Context(DictObject):
     pass
+
+
+def _frozen(self, *args, **kwargs):
+    raise TypeError(
+        '"{}" can not be changed, make copy of it'.format(self.__class__.__name__),
+    )
+
+
+DICT_MUTATORS = (
+    '__setitem__', '__delitem__', '__ior__',
+    'clear', 'pop', 'popitem', 'setdefault', 'update', 'move_to_end',
+)
+
+LIST_MUTATORS = (
+    '__setitem__', '__delitem__', '__setslice__', '__delslice__', '__iadd__', '__imul__',
+    'append', 'extend', 'insert', 'pop', 'remove', 'reverse', 'sort', 'clear',
+)
+
+SET_MUTATORS = (
+    '__ior__', '__iand__', '__isub__', '__ixor__',
+    'add', 'discard', 'remove', 'pop', 'clear', 'update',
+    'difference_update', 'intersection_update', 'symmetric_difference_update',
+)
+
+IMMUTABLE_TYPES = (
+    type(None), bool, int, float, complex, bytes, pyv.unicode,
+    Decimal, Fraction, date, time, timedelta,
+    type, FunctionType, BuiltinFunctionType,
+)
+
+if pyv.IS_PYTHON_2:
+    IMMUTABLE_TYPES += (long, )  # noqa
+
+
+def freeze_methods(names):
+    """
+    Methods which change object are replaced on methods
+    which raise TypeError. Only existing methods are replaced.
+    """
+    def wrapper(cls):
+        for name in names:
+            if hasattr(cls, name):
+                setattr(cls, name, _frozen)
+        return cls
+    return wrapper
+
+
+class FrozenMixin(object):
+    """
+    Frozen object is copied as is. Method "copy"
+    returns shallow copy which can be changed.
+    """
+
+    __mutable_class__ = None
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return freeze, (self.copy(), )
+
+    def copy(self):
+        cls = self.__mutable_class__
+        return _fill(cls, cls.__new__(cls), _items(self), self)
+
+
+@freeze_methods(DICT_MUTATORS + ('__setattr__', '__delattr__'))
+class FrozenDict(FrozenMixin, DictObject):
+    """
+    Dict which can not be changed.
+    """
+
+    __mutable_class__ = DictObject
+
+
+@freeze_methods(LIST_MUTATORS)
+class FrozenList(FrozenMixin, list):
+    """
+    List which can not be changed.
+    """
+
+    __mutable_class__ = list
+
+
+@freeze_methods(SET_MUTATORS)
+class FrozenSet(FrozenMixin, set):
+    """
+    Set which can not be changed. Unlike frozenset
+    it is instance of set as source of it. Results of
+    operators are frozen too on python 2.
+    """
+
+    __mutable_class__ = set
+
+
+_FROZEN_CLASSES = {
+    dict: FrozenDict,
+    list: FrozenList,
+    set: FrozenSet,
+}
+
+
+def get_frozen_class(cls):
+    """
+    Frozen subclass of dict, list or set subclass.
+    It is created once for each of source classes.
+    """
+    try:
+        return _FROZEN_CLASSES[cls]
+    except KeyError:
+        pass
+
+    if issubclass(cls, dict):
+        mutators = DICT_MUTATORS
+    elif issubclass(cls, list):
+        mutators = LIST_MUTATORS
+    else:
+        mutators = SET_MUTATORS
+
+    frozen_class = freeze_methods(mutators)(
+        type(
+            'Frozen{}'.format(cls.__name__),
+            (FrozenMixin, cls),
+            {'__mutable_class__': cls},
+        ),
+    )
+
+    return _FROZEN_CLASSES.setdefault(cls, frozen_class)
+
+
+def _items(obj):
+    if isinstance(obj, dict):
+        return list(obj.items())
+    return list(obj)
+
+
+def _fill(cls, obj, items, source):
+    """
+    Object is filled by methods of mutable class, so
+    methods of frozen class are not called for it.
+    """
+    if issubclass(cls, dict):
+        if issubclass(cls, defaultdict):
+            cls.__init__(obj, source.default_factory)
+        else:
+            cls.__init__(obj)
+        for key, value in items:
+            cls.__setitem__(obj, key, value)
+    elif issubclass(cls, list):
+        list.extend(obj, items)
+    else:
+        set.update(obj, items)
+
+    return obj
+
+
+def _freeze_container(obj):
+    frozen_class = get_frozen_class(obj.__class__)
+
+    if isinstance(obj, dict):
+        items = [(key, freeze(value)) for key, value in obj.items()]
+    else:
+        items = [freeze(item) for item in obj]
+
+    try:
+        frozen = _fill(
+            frozen_class.__mutable_class__,
+            frozen_class.__new__(frozen_class),
+            items,
+            obj,
+        )
+    except TypeError as error:
+        raise FreezeError(
+            'Can not freeze "{}": {}'.format(obj.__class__.__name__, error),
+        )
+
+    # state out of items can not be frozen
+    state = set(getattr(obj, '__dict__', ()))
+    if state - set(getattr(frozen, '__dict__', ())):
+        raise FreezeError(
+            'Can not freeze attributes of "{}"'.format(obj.__class__.__name__),
+        )
+
+    return frozen
+
+
+def freeze(obj):
+    """
+    Frozen copy of obj which can be shared without copy.
+    Dicts, lists and sets are replaced by frozen subclasses
+    of their classes, so order of keys and types are kept.
+    FreezeError is raised for objects which are unknown
+    as immutable, they should be copied for each of users.
+    """
+    if isinstance(obj, (FrozenMixin, IMMUTABLE_TYPES)):
+        return obj
+
+    if isinstance(obj, (dict, list, set)):
+        return _freeze_container(obj)
+
+    if type(obj) is frozenset:
+        return frozenset(freeze(item) for item in obj)
+
+    if type(obj) is tuple:
+        return tuple(freeze(item) for item in obj)
+
+    if isinstance(obj, tuple) and hasattr(obj, '_fields'):
+        return obj.__class__(*(freeze(item) for item in obj))
+
+    raise FreezeError(
+        'Can not freeze "{}"'.format(obj.__class__.__name__),
+    )
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""
+Index of suites, cases and tests by modules for loading
+modules which are needed only. Entry of module is valid while
+mtime and size of file are not changed. Changes in other files
+which module is importing are not tracked, remove index for it.
+"""
+
+import os
+import json
+import logging
+
+from . import loader
+from .collector import get_suite_name_from_command
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_VERSION = 1
+
+
+def file_stamp(file_path):
+    stat = os.stat(file_path)
+    return [stat.st_mtime, stat.st_size]
+
+
+def get_doc(obj):
+    if callable(obj):
+        return obj.__doc__
+    return None
+
+
+def suite_to_entry(suite):
+    mp = suite.get_map()
+
+    return [
+        suite.name,
+        dict(
+            (
+                cls_name,
+                [
+                    get_doc(mp[cls_name]['cls']),
+                    dict(
+                        (test_name, get_doc(test))
+                        for test_name, test in mp[cls_name]['tests'].items()
+                    ),
+                ],
+            )
+            for cls_name in mp
+        ),
+    ]
+
+
+class DocString(object):
+
+    def __init__(self, doc):
+        self.__doc__ = doc
+
+
+class IndexedSuite(object):
+    """
+    Suite from index which is looking like suite for print of tree
+    """
+
+    def __init__(self, name, cases):
+        self.__name = name
+        self.__cases = cases
+
+    @property
+    def name(self):
+        return self.__name
+
+    def get_map(self):
+        return dict(
+            (
+                cls_name,
+                {
+                    'cls': DocString(cls_doc),
+                    'tests': dict(
+                        (test_name, DocString(test_doc))
+                        for test_name, test_doc in tests.items()
+                    ),
+                },
+            )
+            for cls_name, (cls_doc, tests) in self.__cases.items()
+        )
+
+
+class DiscoveryIndex(object):
+
+    def __init__(self, file_path, suites_path):
+        self.__file_path = file_path
+        self.__suites_path = suites_path
+        self.__modules = {}
+        self.__order = []
+
+        if os.path.isfile(file_path):
+            self.read()
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    def read(self):
+        try:
+            with open(self.__file_path) as fp:
+                data = json.load(fp)
+        except ValueError:
+            logger.warning(
+                'Discovery index "{}" is broken and it will be rebuilt'.format(
+                    self.__file_path,
+                ),
+            )
+            return
+
+        if data.get('version') == INDEX_VERSION \
+                and data.get('suites_path') == os.path.abspath(self.__suites_path):
+            self.__modules = data['modules']
+
+    def save(self):
+        with open(self.__file_path, 'w') as fp:
+            json.dump(
+                {
+                    'version': INDEX_VERSION,
+                    'suites_path': os.path.abspath(self.__suites_path),
+                    'modules': dict(
+                        (key, self.__modules[key]) for key in self.__order
+                    ),
+                },
+                fp,
+            )
+
+    def is_fresh(self, key, file_path):
+        entry = self.__modules.get(key)
+        return entry is not None and entry['stamp'] == file_stamp(file_path)
+
+    def suite_names(self, key):
+        return set(name for name, _ in self.__modules[key]['suites'])
+
+    def load(self, suite_class, suite_names=None, recursive=True):
+        """
+        Load suites from modules which are defining needed suites
+        or are not in index. All of modules are loaded if names of
+        suites are not specified. Index is updated by loaded modules.
+        """
+        self.__order = []
+
+        modules = loader.iter_modules_from_path(
+            self.__suites_path, recursive=recursive,
+        )
+
+        for module_name, package, file_path in modules:
+            key = loader.get_module_key(module_name, package=package)
+            self.__order.append(key)
+
+            if suite_names is not None and self.is_fresh(key, file_path):
+                if not suite_names & self.suite_names(key):
+                    logger.debug(
+                        'Module "{}" is skipped by discovery index'.format(key),
+                    )
+                    continue
+
+            module = loader.load_module(module_name, package=package)
+            suites = list(loader.load_suites_from_module(module, suite_class))
+
+            self.__modules[key] = {
+                'stamp': file_stamp(file_path),
+                'suites': [suite_to_entry(suite) for suite in suites],
+            }
+
+            for suite in suites:
+                yield suite
+
+    def suites(self):
+        for key in self.__order:
+            for name, cases in self.__modules[key]['suites']:
+                yield IndexedSuite(name, cases)
+
+
+def load_suites(index, suite_class, config, recursive=True):
+    if config.TREE and not config.TESTS:
+        # tree is printed from index, so stale modules only are loaded
+        suite_names = set()
+    elif config.TESTS:
+        suite_names = set(
+            get_suite_name_from_command(command) for command in config.TESTS
+        )
+    else:
+        suite_names = None
+
+    suites = list(
+        index.load(suite_class, suite_names=suite_names, recursive=recursive),
+    )
+    index.save()
+
+    return suites
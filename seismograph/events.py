@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+Live stream of run events as json lines
+"""
+
+import os
+import time
+import json
+import socket
+import logging
+from threading import Lock
+
+
+logger = logging.getLogger(__name__)
+
+
+UNIX_SOCKET_PREFIX = 'unix:'
+EVENTS_ENCODING = 'utf-8'
+
+RUN_START = 'run_start'
+RUN_END = 'run_end'
+SUITE_START = 'suite_start'
+SUITE_STOP = 'suite_stop'
+CASE_START = 'case_start'
+CASE_STOP = 'case_stop'
+
+STATUS_SKIP = 'skip'
+STATUS_FAIL = 'fail'
+STATUS_ERROR = 'error'
+STATUS_SUCCESS = 'success'
+
+
+def state_to_dict(state):
+    return {
+        'tests': state.tests,
+        'errors': state.errors,
+        'failures': state.failures,
+        'skipped': state.skipped,
+        'successes': state.successes,
+        'runtime': state.runtime,
+    }
+
+
+class EventSink(object):
+    """
+    Writer of event records to file or unix socket.
+    Each record is written by one call, so records
+    from forked worker processes are not mixed up.
+    Address of unix socket is "unix:/path/to/socket".
+    """
+
+    def __init__(self, address):
+        self.__address = address
+        self.__lock = Lock()
+        self.__socket = None
+        self.__fd = None
+
+        if address.startswith(UNIX_SOCKET_PREFIX):
+            self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.__socket.connect(address[len(UNIX_SOCKET_PREFIX):])
+        else:
+            self.__fd = os.open(address, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    @property
+    def address(self):
+        return self.__address
+
+    def emit(self, event, **data):
+        data['event'] = event
+        data['pid'] = os.getpid()
+        data['time'] = time.time()
+
+        line = json.dumps(data, sort_keys=True) + '\n'
+
+        if not isinstance(line, bytes):
+            line = line.encode(EVENTS_ENCODING)
+
+        with self.__lock:
+            try:
+                if self.__socket is not None:
+                    self.__socket.sendall(line)
+                elif self.__fd is not None:
+                    os.write(self.__fd, line)
+            except (IOError, OSError, socket.error) as error:
+                logger.warning(
+                    'Event "{}" was not written to "{}": {}'.format(
+                        event, self.__address, error,
+                    ),
+                )
+
+    def run_start(self, name):
+        self.emit(RUN_START, name=name)
+
+    def run_end(self, name, state):
+        self.emit(RUN_END, name=name, **state_to_dict(state))
+
+    def suite_start(self, name):
+        self.emit(SUITE_START, suite=name)
+
+    def suite_stop(self, name, state):
+        self.emit(SUITE_STOP, suite=name, **state_to_dict(state))
+
+    def case_start(self, class_name, method_name):
+        self.emit(CASE_START, class_name=class_name, method_name=method_name)
+
+    def case_stop(self, xunit_data, status):
+        self.emit(
+            CASE_STOP,
+            status=status,
+            runtime=xunit_data.runtime,
+            class_name=xunit_data.class_name,
+            method_name=xunit_data.method_name,
+        )
+
+    def close(self):
+        with self.__lock:
+            if self.__socket is not None:
+                self.__socket.close()
+                self.__socket = None
+
+            if self.__fd is not None:
+                os.close(self.__fd)
+                self.__fd = None
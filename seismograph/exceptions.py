@@ -51,6 +51,22 @@ class DependencyError(SeismographError):
     pass
 
 
+class BinaryResultError(SeismographError):
+    pass
+
+
+class FixtureError(SeismographError):
+    pass
+
+
+class FreezeError(SeismographError):
+    pass
+
+
+class WorkerError(SeismographError):
+    pass
+
+
 ALLOW_RAISED_EXCEPTIONS = (
     EmergencyStop,
     KeyboardInterrupt,
@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import logging
 from copy import deepcopy
+from threading import RLock
+from threading import local
+from contextlib import contextmanager
 
+from .datastructures import freeze
+from .exceptions import FreezeError
 from .exceptions import ExtensionNotFound
 
 
-_TMP = {}
-_WAS_CLEAR = False
+logger = logging.getLogger(__name__)
 
 
 def install(ext, program):
@@ -56,39 +61,202 @@ class SingletonExtensionContainer(ExtensionContainer):
             ).__call__()
         return self.__instance
 
+    def release(self):
+        self.__instance = None
 
-def get(name):
-    try:
-        container = _TMP[name]
-    except KeyError:
-        if _WAS_CLEAR:
-            raise RuntimeError(
-                'Extension tmp was cleared',
-            )
-        raise ExtensionNotFound(name)
 
-    if isinstance(container, ExtensionContainer):
-        return container()
+class DataCopyContainer(ExtensionContainer):
+    """
+    Data is copied on each getting
+    """
+
+    def __call__(self):
+        return deepcopy(self.ext)
+
+
+class ExtensionRegistry(object):
+    """
+    Extensions and data by names. Each of programs owns
+    its registry, so state is not shared between programs
+    of one process. Extensions and fixtures which are not found
+    in registry are looked up in parent registry. Instances of
+    singleton extensions are released when lifetime is closed.
+    """
+
+    def __init__(self, parent=None):
+        self.__parent = parent
+        self.__lock = RLock()
+        self.__containers = {}
+        self.__fixtures = {}
+        self.__lifetimes = 0
 
-    return deepcopy(container)
+    def __contains__(self, name):
+        if name in self.__containers:
+            return True
+        return self.__parent is not None and name in self.__parent
+
+    def __getitem__(self, name):
+        try:
+            return self.__containers[name]
+        except KeyError:
+            if self.__parent is None:
+                raise
+            return self.__parent[name]
+
+    @property
+    def parent(self):
+        return self.__parent
 
+    def get(self, name):
+        try:
+            container = self[name]
+        except KeyError:
+            raise ExtensionNotFound(name)
 
-def set(ext, name, is_data=False, singleton=False, args=None, kwargs=None):
-    if is_data:
-        _TMP[name] = ext
-    else:
-        if singleton:
-            _TMP[name] = SingletonExtensionContainer(
+        if isinstance(container, SingletonExtensionContainer):
+            # instance is created once by one of threads
+            with self.__lock:
+                return container()
+
+        if isinstance(container, ExtensionContainer):
+            return container()
+
+        return container
+
+    def set(self, ext, name, is_data=False, singleton=False, args=None, kwargs=None, copy=False):
+        if is_data:
+            if copy:
+                container = DataCopyContainer(ext)
+            else:
+                # frozen data is shared between cases without copy,
+                # data which can not be frozen is copied as before
+                try:
+                    container = freeze(ext)
+                except FreezeError as error:
+                    logger.debug(
+                        'Data "{}" is copied for each case: {}'.format(name, error),
+                    )
+                    container = DataCopyContainer(ext)
+        elif singleton:
+            container = SingletonExtensionContainer(
                 ext, args=args, kwargs=kwargs,
             )
         else:
-            _TMP[name] = ExtensionContainer(
+            container = ExtensionContainer(
                 ext, args=args, kwargs=kwargs,
             )
 
+        with self.__lock:
+            self.__containers[name] = container
 
-def clear():
-    global _WAS_CLEAR
+    def pop(self, name, default=None):
+        with self.__lock:
+            return self.__containers.pop(name, default)
+
+    def is_fixture(self, name):
+        if name in self.__fixtures:
+            return True
+        return self.__parent is not None and self.__parent.is_fixture(name)
+
+    def get_fixture(self, name):
+        try:
+            return self.__fixtures[name]
+        except KeyError:
+            if self.__parent is None:
+                raise ExtensionNotFound(name)
+            return self.__parent.get_fixture(name)
+
+    def set_fixture(self, fixture):
+        with self.__lock:
+            self.__fixtures[fixture.name] = fixture
+
+    def pop_fixture(self, name, default=None):
+        with self.__lock:
+            return self.__fixtures.pop(name, default)
+
+    def release(self):
+        with self.__lock:
+            for container in self.__containers.values():
+                if isinstance(container, SingletonExtensionContainer):
+                    container.release()
+
+    @contextmanager
+    def lifetime(self):
+        with self.__lock:
+            self.__lifetimes += 1
+
+        try:
+            if self.__parent is None:
+                yield self
+            else:
+                with self.__parent.lifetime():
+                    yield self
+        finally:
+            with self.__lock:
+                self.__lifetimes -= 1
 
-    _TMP.clear()
-    _WAS_CLEAR = True
+                if self.__lifetimes == 0:
+                    self.release()
+
+    def clear(self):
+        with self.__lock:
+            self.__containers.clear()
+            self.__fixtures.clear()
+
+
+# extensions which are registered out of programs
+_BASE_REGISTRY = ExtensionRegistry()
+
+# registry of running program is current for each of threads
+_LOCAL = local()
+
+
+def create_registry():
+    return ExtensionRegistry(parent=_BASE_REGISTRY)
+
+
+def get_registry():
+    return getattr(_LOCAL, 'registry', None) or _BASE_REGISTRY
+
+
+@contextmanager
+def use_registry(registry):
+    """
+    Registry is current for functions of module in this thread
+    or greenlet only, so threads of run are calling it with
+    registry of program which has started them.
+    """
+    previous = getattr(_LOCAL, 'registry', None)
+    _LOCAL.registry = registry
+
+    try:
+        yield registry
+    finally:
+        _LOCAL.registry = previous
+
+
+def get(name):
+    return get_registry().get(name)
+
+
+def set(ext, name, is_data=False, singleton=False, args=None, kwargs=None, copy=False):
+    get_registry().set(
+        ext,
+        name,
+        is_data=is_data,
+        singleton=singleton,
+        args=args, kwargs=kwargs,
+        copy=copy,
+    )
+
+
+@contextmanager
+def lifetime(registry=None):
+    registry = registry or get_registry()
+
+    with use_registry(registry), registry.lifetime():
+        yield registry
+
+
+def clear():
+    get_registry().clear()
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shared fixtures with scope. Fixture is created on first request
+through "ext" method and it's living until end of scope.
+
+    session: one value for run, it's created in main process
+             before start of workers if it's required by suites
+             directly or through other required fixtures
+    worker:  one value for process of worker
+    suite:   one value for suite, teardown after end of suite
+    case:    one value for case, teardown after end of case
+
+Fixture can require fixtures of the same or wider scope only,
+values of them are passed to factory as keyword arguments.
+
+Fixtures are registered in registry of extensions, so each of
+programs has its fixtures and values of them.
+"""
+
+import os
+import logging
+from threading import Lock
+from threading import RLock
+from weakref import WeakKeyDictionary
+from contextlib import contextmanager
+
+from . import extensions
+from .exceptions import FixtureError
+
+
+logger = logging.getLogger(__name__)
+
+
+SESSION = 'session'
+WORKER = 'worker'
+SUITE = 'suite'
+CASE = 'case'
+
+SCOPES = (SESSION, WORKER, SUITE, CASE)
+
+
+_LOCK = RLock()
+
+
+class Fixture(object):
+
+    def __init__(self, name, factory, scope=SESSION, require=None, teardown=None, args=None, kwargs=None):
+        if scope not in SCOPES:
+            raise FixtureError(
+                'Unknown scope "{}" of fixture "{}"'.format(scope, name),
+            )
+
+        self.__name = name
+        self.__scope = scope
+        self.__factory = factory
+        self.__teardown = teardown
+        self.__require = list(require or [])
+        self.__args = args or tuple()
+        self.__kwargs = kwargs or dict()
+
+    def __repr__(self):
+        return '<Fixture name={} scope={}>'.format(self.__name, self.__scope)
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def scope(self):
+        return self.__scope
+
+    @property
+    def require(self):
+        return self.__require
+
+    def create(self, dependencies):
+        kwargs = dict(self.__kwargs)
+        kwargs.update(dependencies)
+        return self.__factory(*self.__args, **kwargs)
+
+    def teardown(self, value):
+        if self.__teardown is not None:
+            self.__teardown(value)
+
+
+class FixtureScope(object):
+    """
+    Values of fixtures which were created in scope.
+    Teardown is called in reverse order of creation
+    for values which were created by current process.
+    """
+
+    def __init__(self, name):
+        self.__name = name
+        self.__values = {}
+        self.__created = []
+        self.__locks = {}
+        self.__lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.teardown()
+
+    def __contains__(self, name):
+        return name in self.__values
+
+    @property
+    def name(self):
+        return self.__name
+
+    def get(self, name):
+        return self.__values[name]
+
+    def lock(self, name):
+        """
+        Lock of creation of one fixture in scope. Fixtures with
+        other names or of other scopes are created at the same time.
+        """
+        with self.__lock:
+            lock = self.__locks.get(name)
+
+            if lock is None:
+                lock = self.__locks[name] = RLock()
+
+            return lock
+
+    def create(self, fixture, dependencies):
+        logger.debug(
+            'Create fixture "{}" in scope "{}"'.format(fixture.name, self.__name),
+        )
+
+        value = fixture.create(dependencies)
+
+        self.__values[fixture.name] = value
+        self.__created.append((fixture, os.getpid()))
+
+        return value
+
+    def teardown(self):
+        pid = os.getpid()
+        errors = []
+
+        while self.__created:
+            fixture, created_by = self.__created.pop()
+            value = self.__values.pop(fixture.name)
+
+            if created_by != pid:
+                continue
+
+            logger.debug(
+                'Teardown fixture "{}" of scope "{}"'.format(fixture.name, self.__name),
+            )
+
+            try:
+                fixture.teardown(value)
+            except BaseException as error:
+                logger.error(error, exc_info=True)
+                errors.append(fixture.name)
+
+        if errors:
+            raise FixtureError(
+                'Teardown of fixtures "{}" was failed'.format(', '.join(errors)),
+            )
+
+
+class ScopeRegistry(object):
+
+    def __init__(self):
+        self.__session = FixtureScope(SESSION)
+        self.__worker = FixtureScope(WORKER)
+        self.__worker_pid = os.getpid()
+        self.__suites = {}
+        self.__suite_users = {}
+
+    @property
+    def session(self):
+        return self.__session
+
+    @property
+    def worker(self):
+        with _LOCK:
+            if self.__worker_pid != os.getpid():
+                # values of parent are not torn down by fork
+                self.__worker = FixtureScope(WORKER)
+                self.__worker_pid = os.getpid()
+
+            return self.__worker
+
+    def suite(self, suite_name):
+        with _LOCK:
+            scope = self.__suites.get(suite_name)
+
+            if scope is None:
+                scope = self.__suites[suite_name] = FixtureScope(
+                    '{}:{}'.format(SUITE, suite_name),
+                )
+
+            return scope
+
+    @contextmanager
+    def suite_scope(self, suite_name):
+        """
+        Parts of one suite can be running at the same time,
+        so scope is living while the last of them is running.
+        """
+        with _LOCK:
+            self.__suite_users[suite_name] = self.__suite_users.get(suite_name, 0) + 1
+
+        try:
+            yield
+        finally:
+            with _LOCK:
+                self.__suite_users[suite_name] -= 1
+
+                if self.__suite_users[suite_name] == 0:
+                    del self.__suite_users[suite_name]
+                    scope = self.__suites.pop(suite_name, None)
+                else:
+                    scope = None
+
+            if scope is not None:
+                scope.teardown()
+
+
+# scopes of values by registries of extensions
+_SCOPES = WeakKeyDictionary()
+
+
+def get_scopes():
+    registry = extensions.get_registry()
+
+    with _LOCK:
+        scopes = _SCOPES.get(registry)
+
+        if scopes is None:
+            scopes = _SCOPES[registry] = ScopeRegistry()
+
+        return scopes
+
+
+def register(name, factory, scope=SESSION, require=None, teardown=None, args=None, kwargs=None):
+    extensions.get_registry().set_fixture(
+        Fixture(
+            name,
+            factory,
+            scope=scope,
+            require=require,
+            teardown=teardown,
+            args=args, kwargs=kwargs,
+        ),
+    )
+
+
+def is_fixture(name):
+    return extensions.get_registry().is_fixture(name)
+
+
+def get_fixture(name):
+    return extensions.get_registry().get_fixture(name)
+
+
+def get_scope(scope, suite_name=None, case_scope=None):
+    if scope == SESSION:
+        return get_scopes().session
+
+    if scope == WORKER:
+        return get_scopes().worker
+
+    if scope == SUITE and suite_name is not None:
+        return get_scopes().suite(suite_name)
+
+    if scope == CASE and case_scope is not None:
+        return case_scope
+
+    return None
+
+
+def resolve(name, suite_name=None, case_scope=None, resolving=()):
+    fixture = get_fixture(name)
+
+    if name in resolving:
+        raise FixtureError(
+            'Circular dependency of fixtures "{}"'.format(
+                ' -> '.join(resolving + (name, )),
+            ),
+        )
+
+    scope = get_scope(
+        fixture.scope, suite_name=suite_name, case_scope=case_scope,
+    )
+
+    if scope is None:
+        raise FixtureError(
+            'Fixture "{}" of scope "{}" is not available here'.format(
+                name, fixture.scope,
+            ),
+        )
+
+    if name in scope:
+        return scope.get(name)
+
+    dependencies = {}
+
+    for dependency_name in fixture.require:
+        dependency = get_fixture(dependency_name)
+
+        if SCOPES.index(dependency.scope) > SCOPES.index(fixture.scope):
+            raise FixtureError(
+                'Fixture "{}" of scope "{}" can not require fixture "{}" of scope "{}"'.format(
+                    name, fixture.scope, dependency_name, dependency.scope,
+                ),
+            )
+
+        dependencies[dependency_name] = resolve(
+            dependency_name,
+            suite_name=suite_name,
+            case_scope=case_scope,
+            resolving=resolving + (name, ),
+        )
+
+    # factory is called under lock of this fixture only
+    with scope.lock(name):
+        if name in scope:
+            return scope.get(name)
+
+        return scope.create(fixture, dependencies)
+
+
+def get(name, suite_name=None, case_scope=None):
+    return resolve(name, suite_name=suite_name, case_scope=case_scope)
+
+
+def get_session_require(names):
+    """
+    Names of session fixtures which are required by names
+    directly or through require of other fixtures.
+    """
+    session_require = []
+    visited = set()
+    names = list(reversed(names))
+
+    while names:
+        name = names.pop()
+
+        if name in visited or not is_fixture(name):
+            continue
+
+        visited.add(name)
+        fixture = get_fixture(name)
+
+        if fixture.scope == SESSION:
+            session_require.append(name)
+
+        names.extend(reversed(fixture.require))
+
+    return session_require
+
+
+def setup_session(names):
+    """
+    Create fixtures of session scope from names before start of workers,
+    so values are inherited by processes of workers.
+    """
+    for name in get_session_require(names):
+        get(name)
+
+
+def suite_scope(suite_name):
+    return get_scopes().suite_scope(suite_name)
+
+
+@contextmanager
+def session_scope(names=None):
+    if names:
+        setup_session(names)
+
+    try:
+        yield
+    finally:
+        teardown_process()
+
+
+def teardown_process():
+    """
+    Teardown of fixtures of worker and session scopes
+    which were created by current process.
+    """
+    scopes = get_scopes()
+
+    try:
+        scopes.worker.teardown()
+    finally:
+        scopes.session.teardown()
@@ -5,12 +5,14 @@ from __future__ import absolute_import
 from gevent.pool import Pool
 
 from .. import runnable
+from .. import extensions
 from ..groups import get_pool_size_of_value
 from ..exceptions import ALLOW_RAISED_EXCEPTIONS
 
 
-def target(runnable_object, result):
-    runnable_object(result)
+def target(runnable_object, result, registry):
+    with extensions.use_registry(registry):
+        runnable_object(result)
 
 
 class GeventSuiteGroup(runnable.RunnableGroup):
@@ -26,7 +28,7 @@ class GeventSuiteGroup(runnable.RunnableGroup):
 
         try:
             for suite in self.objects:
-                pool.spawn(target, suite, result)
+                pool.spawn(target, suite, result, extensions.get_registry())
 
             pool.join()
         except ALLOW_RAISED_EXCEPTIONS:
@@ -47,7 +49,7 @@ class GeventCaseGroup(runnable.RunnableGroup):
 
         try:
             for case in self.objects:
-                pool.spawn(target, case, result)
+                pool.spawn(target, case, result, extensions.get_registry())
 
             pool.join()
         except ALLOW_RAISED_EXCEPTIONS:
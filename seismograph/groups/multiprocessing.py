@@ -2,40 +2,123 @@
 
 from __future__ import absolute_import
 
+import os
+import time
+import signal
+import logging
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    from StringIO import StringIO
+except ImportError:  # please python 3
+    from io import StringIO
+
+from .. import fixtures
 from .. import runnable
 from ..case import CaseBox
 from ..xunit import XUnitData
+from ..utils.mp import SharedMemory
 from ..utils.common import waiting_for
 from ..groups import get_pool_size_of_value
+from ..exceptions import WorkerError
+from ..exceptions import EmergencyStop
+from ..exceptions import TimeoutException
 
 
-MPProcess = mp_manager = None
+logger = logging.getLogger(__name__)
+
+
+POOL_CHECK_INTERVAL = 1
+
+TASK_START = 'start'
+TASK_CASE = 'case'
+TASK_DONE = 'done'
+TASK_LOST = 'lost'
+
+
+MPProcess = MPQueue = MPEmpty = MPManager = None
 
 
 def import_mp():
-    global MPProcess, mp_manager
+    global MPProcess, MPQueue, MPEmpty, MPManager
 
+    from multiprocessing import Queue
     from multiprocessing import Process
     from multiprocessing import Manager
 
+    try:
+        from Queue import Empty
+    except ImportError:  # please python 3
+        from queue import Empty
+
+    MPQueue = Queue
+    MPEmpty = Empty
     MPProcess = Process
-    mp_manager = Manager()
+    MPManager = Manager
 
 
 def target(suite, mp_result):
-    suite(mp_result)
-    mp_result.save_result()
+    result = mp_result.create_proxy()
+
+    try:
+        suite(result)
+    finally:
+        fixtures.teardown_process()
+
+    mp_result.save_result(result)
+
+
+def run_task(suite, shard, shards, result):
+    if shards > 1:
+        with suite.shard(shard, shards):
+            suite(result)
+    else:
+        suite(result)
+
+
+def worker(suites, tasks, messages, mp_result, stream=False):
+    for task in iter(tasks.get, None):
+        index, shard, shards = task
+        messages.put((TASK_START, task, os.getpid()))
+
+        if stream:
+            result = MPStreamResult(
+                mp_result.create_proxy(stream=StringIO()), task, messages,
+            )
+        else:
+            result = mp_result.create_proxy()
+
+        try:
+            run_task(suites[index], shard, shards, result)
+        finally:
+            if stream:
+                data = (
+                    mp_result.pack_proxies(result.proxies, exclude=result.streamed),
+                    result.read_output(),
+                )
+            else:
+                data = (mp_result.pack_proxies(result.proxies), None)
+
+            messages.put((TASK_DONE, task, data))
+
+    fixtures.teardown_process()
 
 
 class MPResult(object):
+    """
+    Flag "should_stop" of result state is living in shared memory.
+    Value of "stopped_on" is staying local to worker process
+    and it is sent back to parent together with packed result.
+    """
 
     MATCH = {}
 
-    def __init__(self, result):
+    def __init__(self, result, queue=None):
         self.result = result
-        self.queue = mp_manager.Queue()
+        self.queue = queue
 
-        self.result.support_mp(mp_manager)
+        self.result.support_mp(SharedMemory())
 
     def __getattr__(self, item):
         return getattr(self.result, item)
@@ -43,73 +126,175 @@ class MPResult(object):
     @staticmethod
     def pack_result_storage(storage):
         return [
-            (runnable.id, xunit_data.to_marshal())
-            for runnable, xunit_data in storage
+            (
+                runnable_object.id,
+                xunit_data.to_marshal(),
+                runnable.stopped_on(runnable_object),
+            )
+            for runnable_object, xunit_data in storage
         ]
 
     def unpack_result_storage(self, storage):
-        for runnable_id, xunit_data in storage:
-            yield self.MATCH[runnable_id], XUnitData.from_marshal(xunit_data)
+        for runnable_id, xunit_data, stopped_on in storage:
+            runnable_object = self.MATCH[runnable_id]
+            runnable.stopped_on(runnable_object, stopped_on)
+            yield runnable_object, XUnitData.from_marshal(xunit_data)
+
+    @classmethod
+    def pack_storages(cls, proxy, exclude=None):
+        def storage(s):
+            if exclude:
+                s = [item for item in s if item[0].id not in exclude]
+            return cls.pack_result_storage(s)
+
+        return (
+            storage(proxy.successes),
+            storage(proxy.skipped),
+            storage(proxy.failures),
+            storage(proxy.errors),
+        )
+
+    @classmethod
+    def pack_proxies(cls, proxies, exclude=None):
+        return [
+            (proxy.name, proxy.runtime) + cls.pack_storages(proxy, exclude=exclude)
+            for proxy in proxies
+        ]
 
     def match(self, suite):
         self.MATCH[suite.id] = suite
-        suite.support_mp(mp_manager)
 
         for case in suite:
             if isinstance(case, CaseBox):
                 for c in case:
                     self.MATCH[c.id] = c
-                    c.support_mp(mp_manager)
             else:
                 self.MATCH[case.id] = case
-                case.support_mp(mp_manager)
-
-    def save_result(self):
-        if self.result.proxies:
-            self.queue.put(
-                (
-                    self.result.proxies[0].name,
-                    self.result.proxies[0].runtime,
 
-                    self.pack_result_storage(
-                        self.result.successes,
-                    ),
-                    self.pack_result_storage(
-                        self.result.skipped,
-                    ),
-                    self.pack_result_storage(
-                        self.result.failures,
-                    ),
-                    self.pack_result_storage(
-                        self.result.errors,
-                    ),
-                ),
-            )
+    def unpack_storages(self, result_proxy, successes, skipped, failures, errors):
+        result_proxy.errors.extend(
+            self.unpack_result_storage(errors),
+        )
+        result_proxy.successes.extend(
+            self.unpack_result_storage(successes),
+        )
+        result_proxy.skipped.extend(
+            self.unpack_result_storage(skipped),
+        )
+        result_proxy.failures.extend(
+            self.unpack_result_storage(failures),
+        )
 
-    def sync(self):
-        while not self.queue.empty():
-            name, runtime, successes, skipped, failures, errors = self.queue.get()
+        return result_proxy
 
+    def merge(self, packed_proxies):
+        for name, runtime, successes, skipped, failures, errors in packed_proxies:
             result_proxy = self.create_proxy(
                 name=name,
             )
             result_proxy.runtime = runtime
 
-            result_proxy.errors.extend(
-                self.unpack_result_storage(errors),
-            )
-            result_proxy.successes.extend(
-                self.unpack_result_storage(successes),
-            )
-            result_proxy.skipped.extend(
-                self.unpack_result_storage(skipped),
-            )
-            result_proxy.failures.extend(
-                self.unpack_result_storage(failures),
+            self.unpack_storages(
+                result_proxy, successes, skipped, failures, errors,
             )
 
             self.result.extend(result_proxy)
             self.result.proxies.append(result_proxy)
+            self.result.flush_proxy(result_proxy)
+
+    def write_output(self, output):
+        if output:
+            self.result.console.write(output)
+            self.result.console.flush()
+
+    def merge_case(self, suite_proxy, packed_storages, output):
+        case_proxy = self.unpack_storages(
+            self.create_proxy(), *packed_storages
+        )
+
+        suite_proxy.extend(case_proxy)
+        self.result.extend(case_proxy)
+
+        self.write_output(output)
+
+    def merge_suite(self, suite_proxy, packed_proxies, output):
+        for _, runtime, successes, skipped, failures, errors in packed_proxies:
+            result_proxy = self.unpack_storages(
+                self.create_proxy(), successes, skipped, failures, errors,
+            )
+
+            suite_proxy.runtime = max(suite_proxy.runtime or float(), runtime)
+            suite_proxy.extend(result_proxy)
+            self.result.extend(result_proxy)
+
+        self.write_output(output)
+
+    def save_result(self, result):
+        if result.proxies:
+            self.queue.put(
+                self.pack_proxies(result.proxies),
+            )
+
+    def sync(self):
+        while not self.queue.empty():
+            self.merge(self.queue.get())
+
+
+class MPStreamResult(object):
+    """
+    Wrapper of result in worker process for streaming mode.
+    Record of each finished case is sent to parent right away
+    together with console output of the case.
+    """
+
+    def __init__(self, result, task, messages, streamed=None):
+        self.result = result
+        self.task = task
+        self.messages = messages
+        self.streamed = streamed if streamed is not None else set()
+
+    def __getattr__(self, item):
+        return getattr(self.result, item)
+
+    def read_output(self):
+        output = self.result._stream.getvalue()
+
+        self.result._stream.seek(0)
+        self.result._stream.truncate()
+
+        return output
+
+    def send(self, case_proxy):
+        for storage in (
+                case_proxy.errors,
+                case_proxy.skipped,
+                case_proxy.failures,
+                case_proxy.successes):
+            for runnable_object, _ in storage:
+                self.streamed.add(runnable_object.id)
+
+        self.messages.put(
+            (
+                TASK_CASE,
+                self.task,
+                (MPResult.pack_storages(case_proxy), self.read_output()),
+            ),
+        )
+
+    @contextmanager
+    def proxy(self, runnable_object=None, timer=None):
+        if runnable_object is not None:
+            with self.result.proxy(runnable_object, timer=timer) as result_proxy:
+                yield self.__class__(
+                    result_proxy, self.task, self.messages, streamed=self.streamed,
+                )
+            return
+
+        try:
+            with self.result.proxy(timer=timer) as result_proxy:
+                yield result_proxy
+        finally:
+            self.send(result_proxy)
 
 
 class Multiprocessing(object):
@@ -118,7 +303,7 @@ class Multiprocessing(object):
         self.queue = []
         self.stack = []
 
-        self.mp_result = MPResult(result)
+        self.mp_result = MPResult(result, queue=MPManager().Queue())
         self.release_timeout = config.MULTIPROCESSING_TIMEOUT
         self.max_processes = get_pool_size_of_value(config.ASYNC_SUITES)
 
@@ -176,7 +361,7 @@ class Multiprocessing(object):
 
     def serve(self):
         while self.queue:
-            process = self.queue.pop()
+            process = self.queue.pop(0)
             process.start()
             self.stack.append(process)
             self.wait_release()
@@ -184,6 +369,250 @@ class Multiprocessing(object):
         self.join_all()
 
 
+class MultiprocessingPool(object):
+    """
+    Long-lived worker processes are started once and take
+    indexes of suites from the work queue one by one.
+    Parent is waiting for messages from workers and merges
+    result of each suite as soon as it was done.
+
+    In streaming mode workers send record of each finished case
+    and parent merges it to result and prints console output at once.
+
+    With splitting of cases each suite is divided to shards
+    which are running in different workers, results of shards
+    are merged to one proxy of suite.
+    """
+
+    def __init__(self, result, config, suites=None):
+        self.suites = []
+        self.workers = []
+        self.dead_workers = []
+        self.dying = set()
+        self.stream = config.MULTIPROCESSING_STREAM
+        self.split_cases = config.MULTIPROCESSING_SPLIT_CASES
+        self.suite_proxies = {}
+
+        self.tasks = MPQueue()
+        self.messages = MPQueue()
+
+        self.mp_result = MPResult(result)
+        self.release_timeout = config.MULTIPROCESSING_TIMEOUT
+        self.max_processes = get_pool_size_of_value(config.ASYNC_SUITES)
+
+        if suites:
+            self.add_suites(suites)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args, **kwargs):
+        if exc_type is not None:
+            self.terminate_all()
+        self.join_all()
+
+    def add_suite(self, suite):
+        self.mp_result.match(suite)
+        self.suites.append(suite)
+
+    def add_suites(self, suites):
+        for suite in suites:
+            self.add_suite(suite)
+
+    def get_tasks(self):
+        tasks = []
+
+        for index, suite in enumerate(self.suites):
+            if self.split_cases:
+                shards = min(
+                    self.max_processes, sum(len(box) for box in suite),
+                ) or 1
+            else:
+                shards = 1
+
+            tasks.extend((index, shard, shards) for shard in range(shards))
+
+        return tasks
+
+    def start_worker(self):
+        process = MPProcess(
+            target=worker,
+            args=(self.suites, self.tasks, self.messages, self.mp_result),
+            kwargs={'stream': self.stream},
+        )
+        process.start()
+        self.workers.append(process)
+
+    def start_workers(self, count):
+        for _ in range(min(self.max_processes, count)):
+            self.start_worker()
+            self.tasks.put(None)
+
+    def replace_worker(self, process):
+        """
+        Dead worker did not take its stop mark from
+        the queue, so new worker is started without it.
+        """
+        logger.error(
+            'Worker process "{}" died with exit code "{}", start new one'.format(
+                process.pid, process.exitcode,
+            ),
+        )
+
+        self.workers.remove(process)
+        self.dead_workers.append(process)
+        self.start_worker()
+
+    def join_all(self):
+        for process in self.workers + self.dead_workers:
+            process.join(timeout=self.release_timeout)
+
+    def terminate_all(self):
+        for process in self.workers:
+            process.terminate()
+
+    def wait_message(self, running):
+        deadline = time.time() + self.release_timeout
+
+        while True:
+            try:
+                return self.messages.get(timeout=POOL_CHECK_INTERVAL)
+            except MPEmpty:
+                pass
+
+            # worker which was found dead before the queue was
+            # empty has sent all of messages, so its task is lost
+            for process in [p for p in self.workers if p.pid in self.dying]:
+                self.dying.remove(process.pid)
+                task = running.pop(process.pid, None)
+
+                if task is not None or process.exitcode:
+                    self.replace_worker(process)
+
+                if task is not None:
+                    return TASK_LOST, task, process.exitcode
+
+            self.dying = set(p.pid for p in self.workers if not p.is_alive())
+
+            if not any(p.is_alive() or p.pid in running for p in self.workers):
+                raise RuntimeError(
+                    'All worker processes are dead',
+                )
+
+            if time.time() > deadline:
+                raise TimeoutException(
+                    'Worker pool has not been released for "{}" sec.'.format(
+                        self.release_timeout,
+                    ),
+                )
+
+    def get_suite_proxy(self, index):
+        if index not in self.suite_proxies:
+            result_proxy = self.mp_result.create_proxy(
+                name=self.suites[index].name,
+            )
+            self.mp_result.proxies.append(result_proxy)
+            self.suite_proxies[index] = result_proxy
+
+        return self.suite_proxies[index]
+
+    def on_lost(self, task, exitcode):
+        """
+        Cases of lost task are not known in parent,
+        so error is added for the suite.
+        """
+        index, shard, shards = task
+        suite = self.suites[index]
+
+        message = 'Worker process died with exit code "{}" on suite "{}"'.format(
+            exitcode, suite.name,
+        )
+        if shards > 1:
+            message += ' (part {} of {})'.format(shard + 1, shards)
+
+        runnable.stopped_on(suite, '__run__')
+
+        result_proxy = self.mp_result.create_proxy()
+        result_proxy.add_error(suite, message, float(), WorkerError(message))
+
+        self.get_suite_proxy(index).extend(result_proxy)
+        self.mp_result.extend(result_proxy)
+
+    def on_message(self, message, task, data):
+        index = task[0]
+
+        if message == TASK_CASE:
+            self.mp_result.merge_case(
+                self.get_suite_proxy(index), *data
+            )
+        elif self.stream or self.split_cases:
+            packed_proxies, output = data
+
+            if packed_proxies or index in self.suite_proxies:
+                self.mp_result.merge_suite(
+                    self.get_suite_proxy(index), packed_proxies, output,
+                )
+        else:
+            packed_proxies, _ = data
+            self.mp_result.merge(packed_proxies)
+
+    @contextmanager
+    def stop_on_terminate(self):
+        """
+        Run is stopped by SIGTERM like by KeyboardInterrupt,
+        so result of finished cases can be reported.
+        """
+        def handler(*args):
+            raise EmergencyStop('Run was terminated')
+
+        default_handler = signal.signal(signal.SIGTERM, handler)
+
+        try:
+            yield
+        finally:
+            signal.signal(signal.SIGTERM, default_handler)
+
+    def serve(self):
+        running = {}
+        tasks = self.get_tasks()
+        pending = set(tasks)
+        shards = Counter(index for index, _, _ in tasks)
+
+        for task in tasks:
+            self.tasks.put(task)
+
+        self.start_workers(len(tasks))
+
+        with self.stop_on_terminate():
+            while pending:
+                message, task, data = self.wait_message(running)
+
+                if message == TASK_START:
+                    running[data] = task
+                    continue
+
+                if task not in pending:
+                    continue
+
+                if message == TASK_LOST:
+                    self.on_lost(task, data)
+                    message, data = TASK_DONE, ([], None)
+
+                if message == TASK_DONE:
+                    pending.remove(task)
+
+                    for pid in [p for p, t in running.items() if t == task]:
+                        del running[pid]
+
+                self.on_message(message, task, data)
+
+                if message == TASK_DONE:
+                    shards[task[0]] -= 1
+
+                    if not shards[task[0]] and task[0] in self.suite_proxies:
+                        self.mp_result.flush_proxy(self.suite_proxies[task[0]])
+
+
 class MultiprocessingSuiteGroup(runnable.RunnableGroup):
 
     def __run__(self, result):
@@ -191,5 +620,10 @@ class MultiprocessingSuiteGroup(runnable.RunnableGroup):
 
         import_mp()
 
-        with Multiprocessing(result, self.config, suites=self.objects) as mp:
+        if self.config.MULTIPROCESSING_POOL:
+            mp_class = MultiprocessingPool
+        else:
+            mp_class = Multiprocessing
+
+        with mp_class(result, self.config, suites=self.objects) as mp:
             mp.serve()
@@ -5,12 +5,14 @@ from __future__ import absolute_import
 from multiprocessing.pool import ThreadPool
 
 from .. import runnable
+from .. import extensions
 from ..groups import get_pool_size_of_value
 from ..exceptions import ALLOW_RAISED_EXCEPTIONS
 
 
-def target(runnable_object, result):
-    runnable_object(result)
+def target(runnable_object, result, registry):
+    with extensions.use_registry(registry):
+        runnable_object(result)
 
 
 class ThreadingSuiteGroup(runnable.RunnableGroup):
@@ -24,7 +26,9 @@ class ThreadingSuiteGroup(runnable.RunnableGroup):
 
         try:
             for suite in self.objects:
-                pool.apply_async(target, args=(suite, result))
+                pool.apply_async(
+                    target, args=(suite, result, extensions.get_registry()),
+                )
 
             pool.close()
             pool.join()
@@ -44,7 +48,9 @@ class ThreadingCaseGroup(runnable.RunnableGroup):
 
         try:
             for case in self.objects:
-                pool.apply_async(target, args=(case, result))
+                pool.apply_async(
+                    target, args=(case, result, extensions.get_registry()),
+                )
 
             pool.close()
             pool.join()
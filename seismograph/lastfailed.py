@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+"""
+Failures and errors of last runs for rerun of them.
+Tests which were not running are kept in cache from previous
+runs, so cache is not lost after rerun of part of tests.
+Tests which are not found in loaded suites are dropped.
+"""
+
+import os
+import json
+import logging
+
+from . import loader
+from . import runnable
+
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = '.seismograph_last_failed'
+
+
+def get_cache_path(config):
+    return config.LAST_FAILED_CACHE or DEFAULT_CACHE_PATH
+
+
+def to_command(suite_name, case_name, test_name):
+    if case_name and test_name:
+        return '{}:{}.{}'.format(suite_name, case_name, test_name)
+
+    return suite_name
+
+
+def to_key(suite_name, case_name, test_name):
+    """
+    Key of test is the same as "schedule.case_key"
+    """
+    if case_name and test_name:
+        return '{}.{}.{}'.format(suite_name, case_name, test_name)
+
+    return suite_name
+
+
+def find_test(suites, suite_name, case_name, test_name):
+    """
+    Test of cache is looked up in loaded suites, because
+    cases and tests could be renamed or deleted since last run.
+    """
+    for suite in suites:
+        if suite.name != suite_name:
+            continue
+
+        if not case_name:
+            return True
+
+        for case_class in suite.cases:
+            if case_class.__name__ == case_name:
+                return test_name in loader.get_class_metadata(case_class).names
+
+        return False
+
+    return False
+
+
+def iter_result_tests(result_proxy, storages):
+    for storage in storages:
+        for runnable_object, _ in storage:
+            class_name = runnable.class_name(runnable_object)
+
+            if class_name == result_proxy.name:
+                yield result_proxy.name, None, None
+            else:
+                yield (
+                    result_proxy.name,
+                    class_name[len(result_proxy.name) + 1:],
+                    runnable.method_name(runnable_object),
+                )
+
+
+class LastFailedCache(object):
+
+    def __init__(self, file_path):
+        self.__file_path = file_path
+        self.__failed = []
+        self.__modules = {}
+        self.__stale = set()
+
+        if os.path.isfile(file_path):
+            self.read()
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @property
+    def failed(self):
+        return self.__failed
+
+    def __nonzero__(self):
+        return bool(self.__failed)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def read(self):
+        try:
+            with open(self.__file_path) as fp:
+                data = json.load(fp)
+        except ValueError:
+            logger.warning(
+                'Last failed cache "{}" is broken and it will be rewritten'.format(
+                    self.__file_path,
+                ),
+            )
+            return
+
+        if data.get('version') == CACHE_VERSION:
+            self.__failed = [tuple(test) for test in data['failed']]
+            self.__modules = data['modules']
+
+    def save(self):
+        with open(self.__file_path, 'w') as fp:
+            json.dump(
+                {
+                    'version': CACHE_VERSION,
+                    'failed': self.__failed,
+                    'modules': self.__modules,
+                },
+                fp,
+            )
+
+    def keys(self):
+        return set(to_key(*test) for test in self.__failed)
+
+    def suite_names(self):
+        return set(suite_name for suite_name, _, _ in self.__failed)
+
+    def commands(self, suites=None):
+        """
+        Commands for "-t" option. Failed tests of suite are not
+        listed if whole suite was failed, suite is running instead.
+        Tests which are not found in loaded suites are skipped
+        and they are dropped from cache on save.
+        """
+        failed_suites = set(
+            suite_name for suite_name, case_name, _ in self.__failed
+            if not case_name
+        )
+        commands = []
+
+        for suite_name, case_name, test_name in self.__failed:
+            if suites is not None and not find_test(suites, suite_name, case_name, test_name):
+                logger.warning(
+                    'Test "{}" of last failed cache is not found'.format(
+                        to_command(suite_name, case_name, test_name),
+                    ),
+                )
+                self.__stale.add(to_key(suite_name, case_name, test_name))
+                continue
+
+            if case_name and suite_name in failed_suites:
+                continue
+
+            commands.append(to_command(suite_name, case_name, test_name))
+
+        return commands
+
+    def modules(self):
+        """
+        Keys of modules which are defining failed suites.
+        None if some of them are unknown, all modules are needed then.
+        """
+        modules = set()
+
+        for suite_name in self.suite_names():
+            if not self.__modules.get(suite_name):
+                return None
+            modules.update(self.__modules[suite_name])
+
+        return modules
+
+    def is_stale(self, test, suites):
+        if to_key(*test) in self.__stale:
+            return True
+
+        # tests of suites which were not loaded can not be checked
+        suite_name = test[0]
+        if any(suite.name == suite_name for suite in suites):
+            return not find_test(suites, *test)
+
+        return False
+
+    def save_result(self, result, suites, suite_modules=None):
+        logger.debug(
+            'Save last failed tests to "{}"'.format(self.__file_path),
+        )
+
+        suite_names = set(suite.name for suite in suites)
+        was_run = set()
+        failed = []
+
+        for result_proxy in result.proxies:
+            if result_proxy.name not in suite_names:
+                continue
+
+            was_run.add(result_proxy.name)
+            was_run.update(
+                to_key(*test) for test in iter_result_tests(
+                    result_proxy, (result_proxy.successes, result_proxy.skipped),
+                )
+            )
+
+            for test in iter_result_tests(
+                    result_proxy, (result_proxy.failures, result_proxy.errors)):
+                if test not in failed:
+                    was_run.add(to_key(*test))
+                    failed.append(test)
+
+        # failures of tests which were not running are kept
+        # while tests are existing
+        self.__failed = [
+            test for test in self.__failed
+            if to_key(*test) not in was_run and not self.is_stale(test, suites)
+        ] + failed
+
+        for suite_name, modules in (suite_modules or {}).items():
+            self.__modules[suite_name] = sorted(modules)
+
+        failed_suites = self.suite_names()
+        self.__modules = dict(
+            (suite_name, modules)
+            for suite_name, modules in self.__modules.items()
+            if suite_name in failed_suites
+        )
+
+        self.save()
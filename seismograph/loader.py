@@ -18,6 +18,9 @@ DEFAULT_TEST_NAME = 'test'
 
 TASK_NAME_PREFIX = 'task'
 
+STEP_ATTRIBUTE_NAME = '__step__'
+CLASS_METADATA_ATTRIBUTE_NAME = '__class_metadata__'
+
 
 def check_path_is_exist(path):
     if not os.path.exists(path):
@@ -62,23 +65,99 @@ def load_module(module_name, package=None):
     return module
 
 
+def is_test_name(name, test_name_prefix=None, default_test_name=None):
+    return name.startswith((test_name_prefix or TEST_NAME_PREFIX)) \
+        or \
+        name == (default_test_name or DEFAULT_TEST_NAME)
+
+
+class ClassMetadata(object):
+    """
+    Result of scan of attributes of case class.
+    It's made once for class, so loader, tree and steps
+    are not calling dir() and getattr() on each use.
+    """
+
+    __slots__ = (
+        '__tag',
+        '__names',
+        '__flows',
+        '__step_names',
+        '__test_names',
+    )
+
+    def __init__(self, cls):
+        self.__names = tuple(sorted(dir(cls)))
+        self.__test_names = tuple(n for n in self.__names if is_test_name(n))
+        self.__step_names = tuple(
+            n for n in self.__names
+            if not n.startswith('_')
+            and hasattr(getattr(cls, n, None), STEP_ATTRIBUTE_NAME)
+        )
+        self.__tag = getattr(cls, '__tag__', None)
+        self.__flows = getattr(cls, '__flows__', None)
+
+    @property
+    def tag(self):
+        return self.__tag
+
+    @property
+    def names(self):
+        return self.__names
+
+    @property
+    def flows(self):
+        return self.__flows
+
+    @property
+    def step_names(self):
+        return self.__step_names
+
+    @property
+    def test_names(self):
+        return self.__test_names
+
+
+def get_class_metadata(cls):
+    metadata = cls.__dict__.get(CLASS_METADATA_ATTRIBUTE_NAME)
+
+    if metadata is None:
+        metadata = ClassMetadata(cls)
+        setattr(cls, CLASS_METADATA_ATTRIBUTE_NAME, metadata)
+
+    return metadata
+
+
+def reset_class_metadata(cls):
+    """
+    Class was changed, so metadata will be made again on next use
+    """
+    if CLASS_METADATA_ATTRIBUTE_NAME in cls.__dict__:
+        delattr(cls, CLASS_METADATA_ATTRIBUTE_NAME)
+
+
 def load_test_names_from_case(
         cls,
         test_name_prefix=None,
         default_test_name=None):
-    def is_test_name(name):
-        return name.startswith((test_name_prefix or TEST_NAME_PREFIX)) \
-            or \
-            name == (default_test_name or DEFAULT_TEST_NAME)
+    metadata = get_class_metadata(cls)
 
-    for name in sorted(dir(cls)):
-        if is_test_name(name):
-            logger.debug(
-                'Load test "{}" from case "{}.{}"'.format(
-                    name, cls.__module__, cls.__name__,
-                ),
-            )
-            yield name
+    if (test_name_prefix or TEST_NAME_PREFIX) == TEST_NAME_PREFIX \
+            and (default_test_name or DEFAULT_TEST_NAME) == DEFAULT_TEST_NAME:
+        names = metadata.test_names
+    else:
+        names = (
+            n for n in metadata.names
+            if is_test_name(n, test_name_prefix, default_test_name)
+        )
+
+    for name in names:
+        logger.debug(
+            'Load test "{}" from case "{}.{}"'.format(
+                name, cls.__module__, cls.__name__,
+            ),
+        )
+        yield name
 
 
 def load_tests_from_case(
@@ -86,6 +165,7 @@ def load_tests_from_case(
         config=None,
         box_class=None,
         method_name=None,
+        case_factory=None,
         test_name_prefix=None,
         default_test_name=None):
     logger.debug(
@@ -94,14 +174,17 @@ def load_tests_from_case(
         ),
     )
 
-    cls_tag = getattr(cls, '__tag__', None)
+    if case_factory is None:
+        case_factory = lambda c, name, config=None: c(name, config=config)
 
-    if (config and config.TAGS) and (cls_tag not in config.TAGS):
+    metadata = get_class_metadata(cls)
+
+    if (config and config.TAGS) and (metadata.tag not in config.TAGS):
         raise StopIteration
 
     if method_name:
-        for name in filter(lambda n: n == method_name, dir(cls)):
-            case = cls(name, config=config)
+        for name in filter(lambda n: n == method_name, metadata.names):
+            case = case_factory(cls, name, config=config)
             if box_class:
                 yield box_class((case, ))
             else:
@@ -125,13 +208,13 @@ def load_tests_from_case(
 
             for name in names:
                 cases.append(
-                    cls(name, config=config)
+                    case_factory(cls, name, config=config)
                 )
 
             yield box_class(cases)
         else:
             for name in names:
-                yield cls(name, config=config)
+                yield case_factory(cls, name, config=config)
 
 
 def load_suite_by_name(name, suites):
@@ -175,45 +258,84 @@ def load_suites_from_module(module, suite_class):
             yield value
 
 
-def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True):
-    logger.debug(
-        'Load suites from path "{}"'.format(path_to_dir),
-    )
-
+def iter_modules_from_path(path_to_dir, package=None, recursive=True):
+    """
+    Names of modules with packages and paths to files
+    in the same order as suites are loaded from path
+    """
     check_path_is_exist(path_to_dir)
 
     lst_dir = os.listdir(path_to_dir)
     full_path = lambda *n: os.path.join(path_to_dir, *n)
 
-    modules = (n.replace('.py', '') for n in lst_dir if is_py_module(n))
-
-    for module_name in modules:
-        module = load_module(module_name, package=package)
-
-        for suite in load_suites_from_module(module, suite_class):
-            yield suite
+    for file_name in lst_dir:
+        if is_py_module(file_name):
+            yield file_name.replace('.py', ''), package, full_path(file_name)
 
     if recursive:
         packs = (n for n in lst_dir if is_package(full_path(n)))
 
         for pack in packs:
 
-            for suite in load_suites_from_path(
+            for module in iter_modules_from_path(
                     full_path(pack),
-                    suite_class,
                     recursive=recursive,
                     package='{}.{}'.format(package, pack) if package else pack):
-                yield suite
+                yield module
+
+
+def get_module_key(module_name, package=None):
+    return '{}.{}'.format(package, module_name) if package else module_name
+
+
+def iter_suites_from_path(path_to_dir, suite_class, package=None, recursive=True, modules=None):
+    """
+    Suites with keys of modules which they were found in.
+    Only modules from "modules" are loaded if it's specified.
+    """
+    for module_name, module_package, _ in iter_modules_from_path(
+            path_to_dir, package=package, recursive=recursive):
+        key = get_module_key(module_name, package=module_package)
+
+        if modules is not None and key not in modules:
+            logger.debug(
+                'Module "{}" is skipped'.format(key),
+            )
+            continue
+
+        module = load_module(module_name, package=module_package)
+
+        for suite in load_suites_from_module(module, suite_class):
+            yield key, suite
+
+
+def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True, modules=None):
+    logger.debug(
+        'Load suites from path "{}"'.format(path_to_dir),
+    )
+
+    suites = iter_suites_from_path(
+        path_to_dir,
+        suite_class,
+        package=package,
+        recursive=recursive,
+        modules=modules,
+    )
+
+    for _, suite in suites:
+        yield suite
 
 
 def load_separated_classes_for_flows(case_cls):
-    if not case_cls.__flows__ or not isinstance(case_cls.__flows__, (list, tuple)):
+    flows = get_class_metadata(case_cls).flows
+
+    if not flows or not isinstance(flows, (list, tuple)):
         return [case_cls]
 
     new_classes = []
 
-    for flow in case_cls.__flows__:
-        index = case_cls.__flows__.index(flow)
+    for flow in flows:
+        index = flows.index(flow)
         new_class_name = '{}{}'.format(case_cls.__name__, (index + 1))
 
         cls = type(
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+Usage:
+    python -m seismograph.merge <binary results> [options]
+
+Merge binary results of shards (--binary-report) to one result.
+Suites which were split between shards are merged to one suite.
+"""
+
+import sys
+import logging
+from collections import Counter
+from collections import OrderedDict
+
+from . import binary
+from .result import Result
+from .config import Config
+from .config import create_option_parser
+
+
+logger = logging.getLogger(__name__)
+
+
+USAGE = 'python -m seismograph.merge <binary results> [options]'
+
+
+def merge_results(result, file_paths):
+    """
+    Suite is flushed to result right after the last of its parts
+    was merged, so report of it is written while others are merging.
+    Parts of suites are known from headers of files.
+    """
+    proxies = OrderedDict()
+    runtime = float()
+    parts = Counter()
+
+    for file_path in file_paths:
+        parts.update(binary.read_result_header(file_path)['suites'])
+
+    for file_path in file_paths:
+        logger.debug(
+            'Merge binary result "{}"'.format(file_path),
+        )
+
+        header, records = binary.read_result(file_path)
+
+        # shards are running at the same time
+        runtime = max(runtime, header['runtime'])
+
+        for name, suite_runtime, successes, skipped, failures, errors in records:
+            result_proxy = proxies.get(name)
+
+            if result_proxy is None:
+                result_proxy = proxies[name] = result.create_proxy(name=name)
+                result.proxies.append(result_proxy)
+
+            part = result.create_proxy()
+            part.errors.extend(binary.unpack_storage(errors))
+            part.skipped.extend(binary.unpack_storage(skipped))
+            part.failures.extend(binary.unpack_storage(failures))
+            part.successes.extend(binary.unpack_storage(successes))
+
+            result_proxy.runtime = max(result_proxy.runtime or float(), suite_runtime)
+            result_proxy.extend(part)
+            result.extend(part)
+
+            parts[name] -= 1
+
+            if not parts[name]:
+                result.flush_proxy(result_proxy)
+
+    result.runtime = runtime
+
+    return result
+
+
+def main(argv=None):
+    parser = create_option_parser()
+    parser.set_usage(USAGE)
+
+    options, file_paths = parser.parse_args(argv)
+
+    if not file_paths:
+        parser.error('binary results for merge are required')
+
+    config = Config(options=options)
+    # suites are rendered to report one by one
+    config.XUNIT_STREAM = True
+
+    stream = open(config.OUTPUT, 'w') if config.OUTPUT else sys.stdout
+
+    with Result(config, stream=stream) as result:
+        merge_results(result, file_paths)
+
+    sys.exit(not result.current_state.was_success)
+
+
+if __name__ == '__main__':
+    main()
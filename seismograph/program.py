@@ -11,8 +11,11 @@ from . import loader
 from . import runnable
 from .utils import pyv
 from . import collector
+from . import fixtures
+from . import lastfailed
 from . import extensions
 from .suite import Suite
+from .case import get_require_key
 from .result import Result
 from .utils.common import measure_time
 from .utils.common import call_to_chain
@@ -70,6 +73,9 @@ class ProgramContext(runnable.ContextOfRunnableObject):
 
     def install_extensions(self):
         for ext_name in self.__require:
+            if fixtures.is_fixture(ext_name):
+                # fixtures are created on request
+                continue
             if ext_name not in self.__extensions:
                 self.__extensions[ext_name] = extensions.get(ext_name)
 
@@ -175,44 +181,73 @@ class Program(runnable.RunnableObject):
         timer = measure_time()
         self.__result.set_timer(timer)
 
-        self.__context.install_extensions()
+        # registry of program is used while program is running,
+        # singleton extensions are living while program is running
+        with extensions.lifetime(self.__registry):
+            self.__context.install_extensions()
 
-        if self.suites_path:
-            self.load_suites()
+            if self.__config.LAST_FAILED or self.__config.FAILED_FIRST:
+                self.__last_failed = lastfailed.LastFailedCache(
+                    lastfailed.get_cache_path(self.__config),
+                )
 
-        if not self.__suites and not self.__scripts:
-            raise RuntimeError(
-                'No suites or scripts for execution',
-            )
+            if self.__config.LAST_FAILED:
+                self.__rerun_failed = self.select_last_failed()
 
-        self.__suites = collector.create_generator(
-            self.__suites, self.__config,
-        )
+            if self.suites_path:
+                self.load_suites()
 
-        if self.__config.TREE:
-            from .tree import print_tree
-            print_tree(self.__suites)
-
-        group = self._make_group()
-
-        with self.__result:
-            try:
-                self.__context.on_run(self)
-
-                with self.__context(self):
-                    self.run_scripts(run_point='before')
-                    if not self.__config.NO_TESTS:
-                        group(self.__result)
-                    self.run_scripts(run_point='after')
-                    self.__result.stop_timer()
-            except ALLOW_RAISED_EXCEPTIONS:
-                raise
-            except BaseException as error:
-                runnable.set_debug_if_allowed(self.config)
-                tb = traceback.format_exc()
-                self.__context.on_error(error, self, self.__result, tb, timer)
-                self.__result.add_error(
-                    self, tb, timer(), error,
+            if not self.__suites and not self.__scripts:
+                raise RuntimeError(
+                    'No suites or scripts for execution',
+                )
+
+            loaded_suites = list(self.__suites)
+
+            if self.__rerun_failed:
+                # failed tests which are not found now are skipped
+                self.__config.TESTS = self.__last_failed.commands(loaded_suites)
+
+            if self.__config.MULTIPROCESSING:
+                # fixtures of session are created before start of workers,
+                # fixtures which are required by them are resolved too
+                session_require = self.get_require_of_suites()
+            else:
+                session_require = None
+
+            self.__suites = collector.create_generator(
+                self.__suites, self.__config,
+            )
+
+            if self.__config.TREE:
+                from .tree import print_tree
+                print_tree(self.__suites)
+
+            group = self._make_group()
+
+            with self.__result:
+                try:
+                    self.__context.on_run(self)
+
+                    with self.__context(self), fixtures.session_scope(session_require):
+                        self.run_scripts(run_point='before')
+                        if not self.__config.NO_TESTS:
+                            group(self.__result)
+                        self.run_scripts(run_point='after')
+                        self.__result.stop_timer()
+                except ALLOW_RAISED_EXCEPTIONS:
+                    raise
+                except BaseException as error:
+                    runnable.set_debug_if_allowed(self.config)
+                    tb = traceback.format_exc()
+                    self.__context.on_error(error, self, self.__result, tb, timer)
+                    self.__result.add_error(
+                        self, tb, timer(), error,
+                    )
+
+            if self.__last_failed is not None:
+                self.__last_failed.save_result(
+                    self.__result, loaded_suites, suite_modules=self.__suite_modules,
                 )
 
         if self.__exit:
@@ -245,10 +280,16 @@ class Program(runnable.RunnableObject):
 
         self.__suites = []
         self.__scripts = []
+        self.__suite_modules = {}
+        self.__last_failed = None
+        self.__rerun_failed = False
         self.__exit = exit
         self.__is_run = False
         self.__stream = stream
 
+        # extensions of program are not shared with other programs
+        self.__registry = extensions.create_registry()
+
         self.__context = ProgramContext(self.setup, self.teardown)
 
         if self.__layers__:
@@ -327,6 +368,10 @@ class Program(runnable.RunnableObject):
     def result(self):
         return self.__result
 
+    @property
+    def registry(self):
+        return self.__registry
+
     def _make_group(self):
         if self.__suite_group_class__:
             logger.debug(
@@ -400,6 +445,9 @@ class Program(runnable.RunnableObject):
         if name not in self.__context.require:
             raise ExtensionNotRequired(name)
 
+        if fixtures.is_fixture(name):
+            return fixtures.get(name)
+
         return self.__context.extensions.get(name)
 
     def setup(self, *args, **kwargs):
@@ -416,13 +464,11 @@ class Program(runnable.RunnableObject):
         self.__context.teardown_callbacks.append(f)
         return f
 
-    @staticmethod
-    def shared_data(name, data):
-        extensions.set(data, name, is_data=True)
+    def shared_data(self, name, data, copy=False):
+        self.__registry.set(data, name, is_data=True, copy=copy)
 
-    @staticmethod
-    def shared_extension(name, ext, singleton=False, args=None, kwargs=None):
-        extensions.set(
+    def shared_extension(self, name, ext, singleton=False, args=None, kwargs=None):
+        self.__registry.set(
             ext,
             name,
             is_data=False,
@@ -430,6 +476,29 @@ class Program(runnable.RunnableObject):
             args=args, kwargs=kwargs,
         )
 
+    def shared_fixture(self, name, factory, scope=fixtures.SESSION, require=None, teardown=None, args=None, kwargs=None):
+        self.__registry.set_fixture(
+            fixtures.Fixture(
+                name,
+                factory,
+                scope=scope,
+                require=require,
+                teardown=teardown,
+                args=args, kwargs=kwargs,
+            ),
+        )
+
+    def get_require_of_suites(self):
+        require = list(self.__context.require)
+
+        for suite in self.__suites:
+            require.extend(suite.context.require)
+
+            for case_class in suite.cases:
+                require.extend(get_require_key(case_class))
+
+        return require
+
     def suite_is_valid(self, suite):
         is_valid = True
 
@@ -486,13 +555,76 @@ class Program(runnable.RunnableObject):
                 if path not in sys.path:
                     sys.path.append(path)
 
-                self.register_suites(
-                    loader.load_suites_from_path(
-                        path,
-                        self.__suite_class__,
-                        recursive=self.recursive_load,
-                    ),
-                )
+                if self.__config.DISCOVERY_CACHE:
+                    self.register_suites(
+                        self.discover_suites(path),
+                    )
+                else:
+                    self.register_suites(
+                        self.load_suites_from_path(path),
+                    )
+
+    def load_suites_from_path(self, path):
+        if self.__rerun_failed:
+            # modules of failed suites only
+            modules = self.__last_failed.modules()
+        else:
+            modules = None
+
+        suites = loader.iter_suites_from_path(
+            path,
+            self.__suite_class__,
+            recursive=self.recursive_load,
+            modules=modules,
+        )
+
+        for module_key, suite in suites:
+            self.__suite_modules.setdefault(suite.name, set()).add(module_key)
+            yield suite
+
+    def select_last_failed(self):
+        """
+        Failed tests of last run are going to "-t" commands,
+        so only needed suites are built. If tests are specified
+        or nothing was failed, all of tests are running.
+        """
+        if self.__config.TESTS:
+            logger.warning(
+                'Last failed tests are not selected because tests are specified',
+            )
+            return False
+
+        if not self.__last_failed:
+            logger.info(
+                'No failed tests in "{}", all of tests are running'.format(
+                    self.__last_failed.file_path,
+                ),
+            )
+            return False
+
+        # suites are loaded by commands with discovery index
+        self.__config.TESTS = self.__last_failed.commands()
+
+        return True
+
+    def discover_suites(self, path):
+        from . import discovery
+
+        index = discovery.DiscoveryIndex(
+            self.__config.DISCOVERY_CACHE, path,
+        )
+        suites = discovery.load_suites(
+            index,
+            self.__suite_class__,
+            self.__config,
+            recursive=self.recursive_load,
+        )
+
+        if self.__config.TREE and not self.__config.TESTS:
+            from .tree import print_tree
+            print_tree(index.suites())
+
+        return suites
 
     def run_scripts(self, result=None, run_point=None):
         if run_point:
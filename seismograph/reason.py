@@ -1,13 +1,34 @@
 # -*- coding: utf-8 -*-
 
+import os
+import mmap
+import atexit
+import tempfile
+from threading import Lock
+
 from . import runnable
 from .utils import pyv
 
 
+SPILL_ENCODING = 'utf-8'
+LOG_CAPTURE_TITLE = 'Logging capture'
+
+
 def format_reason(reason):
     return reason.__format_reason__()
 
 
+def format_reason_lazy(reason, spill_size=None, log=None):
+    parts = reason.__reason_parts__()
+
+    if log:
+        parts = tuple(parts) + (
+            u'\n{}:\n\n'.format(LOG_CAPTURE_TITLE), log,
+        )
+
+    return LazyReason(parts, spill_size=spill_size)
+
+
 def format_reason_to_output(reason):
     return reason.__format_reason_to_output__()
 
@@ -31,18 +52,19 @@ class Reason(object):
     def config(self):
         return self.__config
 
-    def __format_reason__(self):
+    def __reason_parts__(self):
         if self.__runnable_object.__create_reason__:
-            formatted_reason = (
+            return (
                 runnable.reason(self.__runnable_object),
                 self.__reason,
             )
-        else:
-            formatted_reason = (
-                self.__reason,
-            )
 
-        return u''.join(formatted_reason)
+        return (
+            self.__reason,
+        )
+
+    def __format_reason__(self):
+        return u''.join(self.__reason_parts__())
 
     def __format_reason_to_output__(self):
         tmp = []
@@ -62,6 +84,158 @@ class Reason(object):
         return u'\n'.join(tmp)
 
 
+class SpillFile(object):
+    """
+    Temp file of process for texts of reasons which are too big
+    to keep them in memory. Texts are read back by mmap.
+    """
+
+    def __init__(self):
+        self.__pid = os.getpid()
+        self.__lock = Lock()
+        self.__file = tempfile.TemporaryFile()
+        self.__mmap = None
+
+    @property
+    def pid(self):
+        return self.__pid
+
+    def write(self, data):
+        with self.__lock:
+            self.__file.seek(0, os.SEEK_END)
+            offset = self.__file.tell()
+            self.__file.write(data)
+            self.__file.flush()
+
+        return offset, len(data)
+
+    def read(self, offset, size):
+        with self.__lock:
+            if self.__mmap is None or len(self.__mmap) < offset + size:
+                if self.__mmap is not None:
+                    self.__mmap.close()
+
+                self.__mmap = mmap.mmap(
+                    self.__file.fileno(), 0, access=mmap.ACCESS_READ,
+                )
+
+            return self.__mmap[offset:offset + size]
+
+    def close(self):
+        with self.__lock:
+            if self.__mmap is not None:
+                self.__mmap.close()
+                self.__mmap = None
+            self.__file.close()
+
+
+_spill_file = None
+
+
+def get_spill_file():
+    global _spill_file
+
+    if _spill_file is None or _spill_file.pid != os.getpid():
+        _spill_file = SpillFile()
+        atexit.register(_spill_file.close)
+
+    return _spill_file
+
+
+class LazyReason(object):
+    """
+    Text of reason is joined from parts on first access.
+    Text which is bigger than spill size is moved to spill file
+    and read back on each access, so it's not living in memory.
+    It behaves like unicode string for reading.
+    """
+
+    __slots__ = (
+        '__size',
+        '__text',
+        '__parts',
+        '__spilled',
+    )
+
+    def __init__(self, parts, spill_size=None):
+        self.__text = None
+        self.__spilled = None
+        self.__parts = tuple(parts)
+        self.__size = sum(len(p) for p in self.__parts)
+
+        if spill_size is not None and self.__size > spill_size:
+            spill_file = get_spill_file()
+            offset, size = spill_file.write(
+                u''.join(self.__parts).encode(SPILL_ENCODING),
+            )
+            self.__spilled = (spill_file, offset, size)
+            self.__parts = None
+
+    @property
+    def is_spilled(self):
+        return self.__spilled is not None
+
+    @property
+    def text(self):
+        if self.__spilled is not None:
+            spill_file, offset, size = self.__spilled
+            return spill_file.read(offset, size).decode(SPILL_ENCODING)
+
+        if self.__text is None:
+            self.__text = u''.join(self.__parts)
+            self.__parts = None
+
+        return self.__text
+
+    def __unicode__(self):
+        return self.text
+
+    def __str__(self):
+        if pyv.IS_PYTHON_2:
+            return self.text.encode(SPILL_ENCODING)
+        return self.text
+
+    def __repr__(self):
+        return repr(self.text)
+
+    def __format__(self, format_spec):
+        return format(self.text, format_spec)
+
+    def __len__(self):
+        return len(self.text)
+
+    def __nonzero__(self):
+        return self.__size > 0
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def __eq__(self, other):
+        if isinstance(other, LazyReason):
+            other = other.text
+        return self.text == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.text)
+
+    def __add__(self, other):
+        return self.text + other
+
+    def __radd__(self, other):
+        return other + self.text
+
+    def __contains__(self, item):
+        return item in self.text
+
+    def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self.text, item)
+
+
 def create(runnable_object, reason, config=None):
     return Reason(runnable_object, reason, config)
 
@@ -1,17 +1,36 @@
 # -*- coding: utf-8 -*-
 
+import os
 import sys
+import time
 import logging
+from itertools import count
+from itertools import islice
 from threading import Lock
+from threading import local
+from threading import Thread
+from collections import deque
+from collections import OrderedDict
 from contextlib import contextmanager
 
+from six import itervalues
+
+from . import steps
 from . import xunit
+from . import events
 from . import reason
 from . import runnable
 from .utils import pyv
 from .utils import colors
 from .utils.mp import MPSupportedValue
 
+try:
+    from queue import Empty
+    from queue import Queue
+except ImportError:  # please python 2
+    from Queue import Empty
+    from Queue import Queue
+
 
 lock = Lock()
 logger = logging.getLogger(__name__)
@@ -21,6 +40,41 @@ DEFAULT_NAME = 'seismograph'
 START_MESSAGE = 'Seismograph is measuring'
 
 
+INTERN_SIZE = 10000
+INTERN_LENGTH = 1024
+
+
+class InternTable(object):
+    """
+    Equal short texts (types and messages of exceptions,
+    reasons of skip) are stored as one object. Table is owned
+    by result and it's bounded. Long texts are not interned,
+    so tracebacks are not kept after spill of them.
+    """
+
+    def __init__(self, size=INTERN_SIZE, max_length=INTERN_LENGTH):
+        self.__size = size
+        self.__max_length = max_length
+        self.__strings = {}
+
+    def __len__(self):
+        return len(self.__strings)
+
+    def __call__(self, string):
+        if not isinstance(string, pyv.basestring) or len(string) > self.__max_length:
+            return string
+
+        try:
+            return self.__strings[string]
+        except KeyError:
+            pass
+
+        if len(self.__strings) < self.__size:
+            return self.__strings.setdefault(string, string)
+
+        return string
+
+
 def get_runnable_from_storage_item(item):
     runnable_object, _ = item
     return runnable_object
@@ -38,56 +92,232 @@ def get_last_item_from_storage(storage):
 
 
 def get_xunit_data_from_storage(storage, runnable_object):
-    for item in storage:
-        if get_runnable_from_storage_item(item) == runnable_object:
-            return get_xunit_data_from_storage_item(item)
-    return None
+    return storage.get(runnable_object)
 
 
 def reset_item_of_storage(storage, runnable_object, xunit_data):
     assert isinstance(xunit_data, xunit.XUnitData)
 
-    for item in storage:
-        if get_runnable_from_storage_item(item) == runnable_object:
-            storage.remove(item)
-            storage.append((runnable_object, xunit_data))
-            return True
+    return storage.reset(runnable_object, xunit_data)
 
-    return False
+
+def get_storage_key(runnable_object):
+    return getattr(runnable_object, 'id', None) or id(runnable_object)
 
 
 def get_runtime_from_storage(storage):
-    rt = float()
-    for item in storage:
-        rt += get_xunit_data_from_storage_item(item).runtime
-    return rt
+    return storage.runtime
 
 
-class CaptureStream(object):
+class ResultStorage(object):
+    """
+    Storage of (runnable object, xunit data) items of result.
+    It's keeping order of adding and behaves like list,
+    but search and reset of item by runnable object are O(1).
+    Sum of runtime is updated with each change of storage.
+    In compact mode runnable objects are replaced by handles.
+    """
 
-    def __init__(self):
-        self.__buffer = []
+    def __init__(self, items=None, compact=False):
+        self.__compact = compact
+        self.__lock = Lock()
+        self.__keys = count()
+        self.__items = OrderedDict()
+        self.__index = {}
+        self.__runtime = float()
+
+        if items:
+            self.extend(items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __iter__(self):
+        with self.__lock:
+            items = list(itervalues(self.__items))
+        return iter(items)
+
+    def __nonzero__(self):
+        return bool(self.__items)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        if index < 0:
+            index += len(self.__items)
+
+        if not 0 <= index < len(self.__items):
+            raise IndexError('storage index out of range')
+
+        with self.__lock:
+            if index == len(self.__items) - 1:
+                return self.__items[next(reversed(self.__items))]
+            return next(islice(itervalues(self.__items), index, None))
+
+    def __repr__(self):
+        return repr(list(self))
+
+    @property
+    def runtime(self):
+        return self.__runtime
+
+    def append(self, item):
+        if self.__compact:
+            runnable_object, xunit_data = item
+            item = (runnable.handle(runnable_object), xunit_data)
+
+        key = get_storage_key(get_runnable_from_storage_item(item))
+
+        with self.__lock:
+            item_key = next(self.__keys)
+            self.__items[item_key] = item
+            self.__index.setdefault(key, []).append(item_key)
+            self.__runtime += get_xunit_data_from_storage_item(item).runtime
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def remove(self, item):
+        key = get_storage_key(get_runnable_from_storage_item(item))
+
+        with self.__lock:
+            for item_key in self.__index.get(key, []):
+                if self.__items[item_key] == item:
+                    self.__delete(key, item_key)
+                    return
 
-    def __getattr__(self, item):
-        return getattr(sys.stderr, item)
+        raise ValueError('item is not in storage')
 
-    def write(self, s):
-        self.__buffer.append(s)
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
+            self.__index.clear()
+            self.__runtime = float()
+
+    def get(self, runnable_object):
+        with self.__lock:
+            item_keys = self.__index.get(get_storage_key(runnable_object))
+
+            if item_keys:
+                return get_xunit_data_from_storage_item(
+                    self.__items[item_keys[0]],
+                )
+
+        return None
+
+    def reset(self, runnable_object, xunit_data):
+        key = get_storage_key(runnable_object)
+
+        with self.__lock:
+            item_keys = self.__index.get(key)
+
+            if not item_keys:
+                return False
+
+            self.__delete(key, item_keys[0])
+
+        self.append((runnable_object, xunit_data))
+
+        return True
+
+    def __delete(self, key, item_key):
+        item = self.__items.pop(item_key)
+
+        if self.__items:
+            self.__runtime -= get_xunit_data_from_storage_item(item).runtime
+        else:
+            self.__runtime = float()
+
+        item_keys = self.__index[key]
+        item_keys.remove(item_key)
+
+        if not item_keys:
+            del self.__index[key]
+
+
+class LogBuffer(object):
+    """
+    Ring buffer of log records. Records are formatted
+    on flush only, so dropped buffer costs nothing.
+    """
+
+    def __init__(self, size=None):
+        self.__records = deque(maxlen=size)
+
+    def __len__(self):
+        return len(self.__records)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def __nonzero__(self):
+        return bool(self.__records)
+
+    def resize(self, size):
+        self.__records = deque(self.__records, maxlen=size)
+
+    def append(self, handler, record):
+        self.__records.append((handler, record))
+
+    def clear(self):
+        self.__records.clear()
+
+    def getvalue(self):
+        return u''.join(
+            pyv.unicode_string(handler.format(record)) + getattr(handler, 'terminator', '\n')
+            for handler, record in list(self.__records)
+        )
 
     def flush(self, fp=None):
-        if fp and self.__buffer:
+        if fp and self.__records:
             with lock:
-                fp.write('\nLogging capture:\n\n')
-                for s in self.__buffer:
-                    fp.write(s)
-                    fp.flush()
-            self.__buffer = []
+                fp.write('\n{}:\n\n'.format(reason.LOG_CAPTURE_TITLE))
+                fp.write(self.getvalue())
+                fp.flush()
+            self.clear()
+
+
+class CaptureHandler(logging.Handler):
+    """
+    Handler in place of stream handler of logger.
+    Record is going to buffer of current case or
+    to common buffer if case is not running in this thread.
+    """
+
+    def __init__(self, handler, buffer):
+        super(CaptureHandler, self).__init__(level=handler.level)
+
+        self.__handler = handler
+        self.__buffer = buffer
+
+    @property
+    def handler(self):
+        return self.__handler
+
+    def emit(self, record):
+        if not self.__handler.filter(record):
+            return
+
+        buffer = getattr(_capture_local, 'buffer', None)
+
+        if buffer is None:
+            buffer = self.__buffer
+
+        buffer.append(self.__handler, record)
+
+
+_capture_local = local()
 
 
 class LogCapture(object):
 
-    was_captured = []
-    stream = CaptureStream()
+    was_captured = set()
+    buffer = LogBuffer()
 
     def __init__(self, config):
         self.__config = config
@@ -104,19 +334,153 @@ class LogCapture(object):
             if isinstance(logger, logging.Logger):
                 yield logger
 
+    @staticmethod
+    def current_buffer():
+        return getattr(_capture_local, 'buffer', None)
+
+    @staticmethod
+    @contextmanager
+    def case_buffer(size=None):
+        """
+        Records from current thread are going to
+        own buffer of case while context is active
+        """
+        previous = getattr(_capture_local, 'buffer', None)
+        _capture_local.buffer = LogBuffer(size)
+
+        try:
+            yield _capture_local.buffer
+        finally:
+            _capture_local.buffer = previous
+
     def make(self):
+        self.buffer.resize(self.__config.LOG_CAPTURE_SIZE)
+
         for logger in self.loggers:
             if logger in self.was_captured:
                 continue
 
-            for handler in logger.handlers:
+            for index, handler in enumerate(logger.handlers):
                 if handler.__class__ == logging.StreamHandler:
-                    handler.stream = self.stream
+                    logger.handlers[index] = CaptureHandler(handler, self.buffer)
 
-            self.was_captured.append(logger)
+            self.was_captured.add(logger)
 
     def flush(self, fp):
-        self.stream.flush(fp)
+        self.buffer.flush(fp)
+
+
+class ConsoleWriter(object):
+    """
+    Writer of console output from separate thread.
+    Consoles are putting rendered chunks to queue and
+    thread is writing them to stream by large chunks.
+    Chunk of console is not split, so output of each
+    result proxy is going together as without the writer.
+    """
+
+    __stop__ = object()
+    __flush__ = object()
+
+    FLUSH_SIZE = 64 * 1024
+    FLUSH_INTERVAL = 0.1
+
+    def __init__(self, stream, flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.__stream = stream
+        self.__flush_size = flush_size
+        self.__flush_interval = flush_interval
+
+        self.__queue = Queue()
+        self.__pid = os.getpid()
+        self.__thread = None
+
+    @property
+    def stream(self):
+        return self.__stream
+
+    @property
+    def is_alive(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self):
+        if self.__thread is None:
+            self.__thread = Thread(target=self.__run)
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def write(self, chunk):
+        if not chunk:
+            return
+
+        # thread was not forked to child process,
+        # so output is written at once there
+        if self.__pid != os.getpid():
+            with lock:
+                self.__stream.write(chunk)
+                self.__stream.flush()
+            return
+
+        self.start()
+        self.__queue.put(chunk)
+
+    def flush(self):
+        """
+        Write all of queued chunks and wait for it
+        """
+        if self.is_alive:
+            self.__queue.put(self.__flush__)
+            self.__queue.join()
+
+    def close(self):
+        if self.is_alive:
+            self.__queue.put(self.__stop__)
+            self.__thread.join()
+
+        self.__thread = None
+
+    def __write(self, chunks):
+        if chunks:
+            with lock:
+                self.__stream.write(u''.join(chunks))
+                self.__stream.flush()
+
+    def __run(self):
+        chunks = []
+        size = 0
+        deadline = None
+
+        while True:
+            timeout = None
+
+            if deadline is not None:
+                timeout = max(deadline - time.time(), 0)
+
+            try:
+                chunk = self.__queue.get(timeout=timeout)
+            except Empty:
+                chunk = None
+
+            if chunk is self.__stop__:
+                self.__write(chunks)
+                self.__queue.task_done()
+                break
+
+            if chunk is not None and chunk is not self.__flush__:
+                if not chunks:
+                    deadline = time.time() + self.__flush_interval
+                chunks.append(chunk)
+                size += len(chunk)
+
+            if chunk is self.__flush__ \
+                    or size >= self.__flush_size \
+                    or (deadline is not None and time.time() >= deadline):
+                self.__write(chunks)
+                chunks = []
+                size = 0
+                deadline = None
+
+            if chunk is not None:
+                self.__queue.task_done()
 
 
 class Console(object):
@@ -177,16 +541,19 @@ class Console(object):
             yield
             self.__tabs = current_tabs
 
-        def flush(self, stream):
-            stream.write(
-                u''.join(self.__buffer),
-            )
+        def render(self):
+            chunk = u''.join(self.__buffer)
             self.__buffer = []
+            return chunk
 
-    def __init__(self, stream=None, verbose=False):
+        def flush(self, stream):
+            stream.write(self.render())
+
+    def __init__(self, stream=None, verbose=False, writer=None):
         self.__buffer = []
         self.__children = []
 
+        self.__writer = writer
         self.__verbose = verbose
         self.__stream = stream or sys.stdout
 
@@ -199,7 +566,22 @@ class Console(object):
         self.__children.append(child_console)
         return child_console
 
+    @property
+    def writer(self):
+        return self.__writer
+
+    def render(self):
+        chunk = u''.join(self.__buffer) + u''.join(
+            child.render() for child in self.__children
+        )
+        self.__buffer = []
+        return chunk
+
     def flush(self):
+        if self.__writer:
+            self.__writer.write(self.render())
+            return
+
         with lock:
             self.__stream.write(
                 u''.join(self.__buffer),
@@ -343,11 +725,15 @@ class Result(object):
 
     __marker_class__ = Markers
 
-    def __init__(self, config, name=None, stream=None, current_state=None, is_proxy=False):
-        self.errors = []
-        self.skipped = []
-        self.failures = []
-        self.successes = []
+    def __init__(self, config, name=None, stream=None, current_state=None, is_proxy=False,
+                 console_writer=None, event_sink=None, intern_table=None):
+        # lazy cases are not kept alive by result
+        compact = config.COMPACT_RESULT or config.LAZY_CASES
+
+        self.errors = ResultStorage(compact=compact)
+        self.skipped = ResultStorage(compact=compact)
+        self.failures = ResultStorage(compact=compact)
+        self.successes = ResultStorage(compact=compact)
 
         self.proxies = []
 
@@ -355,6 +741,7 @@ class Result(object):
         self.__is_proxy = is_proxy
         self.__name = name or DEFAULT_NAME
         self.__current_state = current_state or State(self)
+        self.__state = None
 
         self._stream = stream or sys.stdout
         self._marker = self.__marker_class__(self.__config)
@@ -362,9 +749,24 @@ class Result(object):
         self.__timer = None
         self.__runtime = None
         self.__capture = None
+        self.__xunit_writer = None
+
+        if not is_proxy and self.__config.BUFFERED_CONSOLE:
+            console_writer = ConsoleWriter(self._stream)
+
+        if not is_proxy and self.__config.EVENTS:
+            event_sink = events.EventSink(self.__config.EVENTS)
+
+        if not is_proxy and self.__config.COMPACT_RESULT:
+            intern_table = InternTable()
+
+        self.__event_sink = event_sink
+        self.__intern_table = intern_table
+        self.__console_writer = console_writer
         self.__console = Console(
             self._stream,
             verbose=self.__config.VERBOSE,
+            writer=self.__console_writer,
         )
 
         if not is_proxy:
@@ -372,6 +774,11 @@ class Result(object):
 
             self.__capture = LogCapture(config)
 
+            if self.__config.XUNIT_STREAM and self.__config.XUNIT_REPORT:
+                self.__xunit_writer = xunit.XUnitStreamWriter(
+                    self.__config.XUNIT_REPORT,
+                )
+
             if self.__config.GEVENT:
                 from gevent.lock import Semaphore
 
@@ -389,9 +796,24 @@ class Result(object):
     def __exit__(self, *args, **kwargs):
         self.final()
 
-        if self.__config.XUNIT_REPORT:
+        if self.__xunit_writer:
+            self.__xunit_writer.close(self)
+        elif self.__config.XUNIT_REPORT:
             self.create_report(self.__config.XUNIT_REPORT)
 
+        if self.__config.BINARY_REPORT:
+            from .binary import write_result
+
+            write_result(self, self.__config.BINARY_REPORT)
+
+        if self.__config.TIMINGS_DB:
+            from .timings import TimingsStore
+
+            TimingsStore(self.__config.TIMINGS_DB).save_result(self)
+
+        if self.__event_sink:
+            self.__event_sink.close()
+
     def __repr__(self):
         state = self.get_state()
         return '<Result(tests={}, failures={}, errors={}, skipped={} success={})>'.format(
@@ -447,14 +869,28 @@ class Result(object):
     def create_proxy(self, **kwargs):
         logger.debug('Create proxy to result')
 
+        kwargs.setdefault('stream', self._stream)
+
+        if kwargs['stream'] is self._stream:
+            kwargs.setdefault('console_writer', self.__console_writer)
+
+        kwargs.setdefault('event_sink', self.__event_sink)
+        kwargs.setdefault('intern_table', self.__intern_table)
+
         return self.__class__(
             self.__config,
             is_proxy=True,
-            stream=self._stream,
             current_state=self.__current_state,
             **kwargs
         )
 
+    def flush_proxy(self, proxy):
+        """
+        Proxy of suite was closed and it will not be changed more
+        """
+        if self.__xunit_writer:
+            self.__xunit_writer.write_suite(proxy)
+
     def extend(self, result):
         assert result.is_proxy, 'result can not be extended from no proxy'
 
@@ -484,6 +920,9 @@ class Result(object):
             proxy.set_timer(timer)
 
             self.proxies.append(proxy)
+
+            if self.__event_sink:
+                self.__event_sink.suite_start(proxy.name)
         else:
             proxy = self.create_proxy()
 
@@ -494,10 +933,31 @@ class Result(object):
             self.extend(proxy)
             proxy.console.flush()
 
+            if runnable_object:
+                self.flush_proxy(proxy)
+
+                if self.__event_sink:
+                    self.__event_sink.suite_stop(proxy.name, proxy.get_state())
+
+    @contextmanager
+    def capture_log(self):
+        """
+        Log of runnable object is captured to own buffer
+        and it's going to reason of fail or error only
+        """
+        if self.__config.NO_CAPTURE:
+            yield None
+        else:
+            with LogCapture.case_buffer(self.__config.LOG_CAPTURE_SIZE) as buffer:
+                yield buffer
+
     def get_state(self):
-        return State(
-            self, should_stop=self.__current_state.should_stop,
-        )
+        should_stop = self.__current_state.should_stop
+
+        if self.__state is None or self.__state.should_stop != should_stop:
+            self.__state = State(self, should_stop=should_stop)
+
+        return self.__state
 
     def get_fail_by(self, runnable_object):
         return get_xunit_data_from_storage(self.failures, runnable_object)
@@ -523,6 +983,19 @@ class Result(object):
     def reset_success(self, runnable_object, xunit_data):
         return reset_item_of_storage(self.successes, runnable_object, xunit_data)
 
+    def __intern(self, xunit_data):
+        if self.__intern_table is not None:
+            xunit_data.intern(self.__intern_table)
+
+    def __format_reason(self, crash_reason):
+        log = LogCapture.current_buffer()
+
+        return reason.format_reason_lazy(
+            crash_reason,
+            log=log.getvalue() if log else None,
+            spill_size=self.__config.REASON_SPILL_SIZE,
+        )
+
     def add_error(self, runnable_object, traceback, runtime, exc):
         error_reason = reason.create(
             runnable_object, traceback, config=self.__config,
@@ -531,13 +1004,15 @@ class Result(object):
         xunit_data = xunit.XUnitData(
             exc=exc,
             runtime=runtime,
-            reason=reason.format_reason(error_reason),
+            reason=self.__format_reason(error_reason),
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.stopped_on(runnable_object),
+            steps=steps.get_steps_runtime(runnable_object),
         )
 
+        self.__intern(xunit_data)
         self.errors.append((runnable_object, xunit_data))
-        self.finish(self._marker.error())
+        self.finish(self._marker.error(), xunit_data, events.STATUS_ERROR)
 
         if self.__config.STOP:
             self.__current_state.should_stop = True
@@ -550,13 +1025,15 @@ class Result(object):
         xunit_data = xunit.XUnitData(
             exc=exc,
             runtime=runtime,
-            reason=reason.format_reason(fail_reason),
+            reason=self.__format_reason(fail_reason),
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.stopped_on(runnable_object),
+            steps=steps.get_steps_runtime(runnable_object),
         )
 
+        self.__intern(xunit_data)
         self.failures.append((runnable_object, xunit_data))
-        self.finish(self._marker.fail())
+        self.finish(self._marker.fail(), xunit_data, events.STATUS_FAIL)
 
         if self.__config.STOP:
             self.__current_state.should_stop = True
@@ -566,10 +1043,11 @@ class Result(object):
             runtime=runtime,
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.method_name(runnable_object),
+            steps=steps.get_steps_runtime(runnable_object),
         )
 
         self.successes.append((runnable_object, xunit_data))
-        self.finish(self._marker.success())
+        self.finish(self._marker.success(), xunit_data, events.STATUS_SUCCESS)
 
     def add_skip(self, runnable_object, reason, runtime):
         xunit_data = xunit.XUnitData(
@@ -577,10 +1055,12 @@ class Result(object):
             runtime=runtime,
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.method_name(runnable_object),
+            steps=steps.get_steps_runtime(runnable_object),
         )
 
+        self.__intern(xunit_data)
         self.skipped.append((runnable_object, xunit_data))
-        self.finish(self._marker.skip(reason))
+        self.finish(self._marker.skip(reason), xunit_data, events.STATUS_SKIP)
 
     def create_report(self, file_path):
         if self.__is_proxy:
@@ -599,12 +1079,21 @@ class Result(object):
                 '* {}: '.format(str(runnable_object)),
             )
 
-    def finish(self, status):
+        if self.__event_sink:
+            self.__event_sink.case_start(
+                runnable.class_name(runnable_object),
+                runnable.method_name(runnable_object),
+            )
+
+    def finish(self, status, xunit_data=None, event_status=None):
         if self.__config.VERBOSE:
             self.__console.writeln(status)
         else:
             self.__console.write(status)
 
+        if self.__event_sink and xunit_data is not None:
+            self.__event_sink.case_stop(xunit_data, event_status)
+
     def begin(self):
         if self.__is_proxy:
             raise RuntimeError(
@@ -618,6 +1107,12 @@ class Result(object):
         self.__console.line_break()
         self.console.flush()
 
+        if self.__event_sink:
+            self.__event_sink.run_start(self.__name)
+
+        if self.__console_writer:
+            self.__console_writer.flush()
+
     def final(self):
         if self.__is_proxy:
             raise RuntimeError(
@@ -679,5 +1174,11 @@ class Result(object):
         self.__console.writeln(total)
         self.__console.flush()
 
+        if self.__event_sink:
+            self.__event_sink.run_end(self.__name, self.get_state())
+
+        if self.__console_writer:
+            self.__console_writer.close()
+
         if self.__capture:
             self.__capture.flush(self._stream)
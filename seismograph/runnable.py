@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import sys
+from itertools import count
 from functools import wraps
 from collections import OrderedDict
 from contextlib import contextmanager
@@ -9,6 +10,13 @@ from .utils import pyv
 from .utils.mp import MPSupportedValue
 
 
+_ids = count(1)
+
+
+def new_id():
+    return next(_ids)
+
+
 def run(runnable, *args, **kwargs):
     return runnable.__run__(*args, **kwargs)
 
@@ -96,7 +104,7 @@ class RunnableObject(object):
     __create_reason__ = False
 
     def __init__(self):
-        self.__id = id(self)
+        self.__id = new_id()
         self.__stopped_on = MPSupportedValue(
             method_name(self),
         )
@@ -117,6 +125,10 @@ class RunnableObject(object):
     def id(self):
         return self.__id
 
+    @id.setter
+    def id(self, value):
+        self.__id = value
+
     @property
     def _stopped_on(self):
         return self.__stopped_on.value
@@ -165,6 +177,76 @@ class RunnableObject(object):
         )
 
 
+class RunnableHandle(object):
+    """
+    Light copy of finished runnable object for result storages.
+    It's keeping what is needed for reports only, so live
+    object with context, layers and extensions can be released.
+    """
+
+    __slots__ = (
+        '__id',
+        '__repr',
+        '__class_name',
+        '__stopped_on',
+        '__method_name',
+    )
+
+    __create_reason__ = False
+
+    def __init__(self, runnable_object):
+        self.__id = getattr(runnable_object, 'id', None) or id(runnable_object)
+        self.__repr = repr(runnable_object)
+        self.__class_name = class_name(runnable_object)
+        self.__stopped_on = stopped_on(runnable_object)
+        self.__method_name = method_name(runnable_object)
+
+    @classmethod
+    def restore(cls, obj_repr, class_name, method_name, stopped_on):
+        """
+        Handle of runnable object from saved result of other process
+        """
+        obj = cls.__new__(cls)
+
+        obj.__id = id(obj)
+        obj.__repr = obj_repr
+        obj.__class_name = class_name
+        obj.__stopped_on = stopped_on
+        obj.__method_name = method_name
+
+        return obj
+
+    def __repr__(self):
+        return self.__repr
+
+    @property
+    def id(self):
+        return self.__id
+
+    @property
+    def _stopped_on(self):
+        return self.__stopped_on
+
+    @_stopped_on.setter
+    def _stopped_on(self, value):
+        self.__stopped_on = value
+
+    def __method_name__(self):
+        return self.__method_name
+
+    def __stopped_on__(self):
+        return self.__stopped_on
+
+    def __class_name__(self):
+        return self.__class_name
+
+
+def handle(runnable_object):
+    if isinstance(runnable_object, RunnableHandle):
+        return runnable_object
+    return RunnableHandle(runnable_object)
+
+
 class BuildObjectMixin(object):
 
     def __is_build__(self):
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+"""
+Order of run by runtime from previous runs
+"""
+
+import os
+import logging
+from xml.etree import ElementTree
+
+from . import runnable
+from .suite import Suite
+from .case import CaseBox
+
+
+logger = logging.getLogger(__name__)
+
+
+def case_key(case):
+    return '{}.{}'.format(
+        runnable.class_name(case), runnable.method_name(case),
+    )
+
+
+def box_key(box):
+    return ','.join(case_key(case) for case in box)
+
+
+def load_runtimes_from_xunit(file_path):
+    logger.debug(
+        'Load runtimes from xunit report "{}"'.format(file_path),
+    )
+
+    runtimes = Runtimes()
+    tree = ElementTree.parse(file_path)
+
+    for suite in tree.getroot().iter('testsuite'):
+        runtimes.suites[suite.get('name')] = float(suite.get('time') or 0)
+
+        for case in suite.iter('testcase'):
+            key = '{}.{}'.format(case.get('classname'), case.get('name'))
+            runtimes.cases[key] = float(case.get('time') or 0)
+
+    return runtimes
+
+
+def load_runtimes(path):
+    """
+    Runtimes from xunit report or timings database.
+    None if file does not exist yet (first run) or it can't be
+    read, default order is used then.
+    """
+    from sqlite3 import DatabaseError
+
+    from .timings import TimingsStore
+    from .timings import is_timings_db
+
+    if not os.path.isfile(path):
+        logger.warning(
+            'File of runtimes "{}" does not exist, default order is used'.format(path),
+        )
+        return None
+
+    try:
+        if is_timings_db(path):
+            return TimingsStore(path).load_runtimes()
+
+        return load_runtimes_from_xunit(path)
+    except (ElementTree.ParseError, DatabaseError, ValueError) as error:
+        logger.warning(
+            'Runtimes can not be loaded from "{}", default order is used: {}'.format(
+                path, error,
+            ),
+        )
+        return None
+
+
+class Runtimes(object):
+
+    def __init__(self, suites=None, cases=None):
+        self.__suites = suites or {}
+        self.__cases = cases or {}
+
+    @property
+    def suites(self):
+        return self.__suites
+
+    @property
+    def cases(self):
+        return self.__cases
+
+    @staticmethod
+    def mean(runtimes):
+        if runtimes:
+            return sum(runtimes.values()) / len(runtimes)
+        return float()
+
+    def default(self, obj):
+        if isinstance(obj, CaseBox):
+            return self.mean(self.__cases) * len(obj)
+
+        if isinstance(obj, Suite):
+            return self.mean(self.__suites)
+
+        return self.mean(self.__cases)
+
+    def of_case(self, case):
+        return self.__cases.get(case_key(case))
+
+    def of_box(self, box):
+        runtime = None
+
+        for case in box:
+            case_runtime = self.of_case(case)
+            if case_runtime is not None:
+                runtime = (runtime or float()) + case_runtime
+
+        return runtime
+
+    def of_suite(self, suite):
+        runtime = self.__suites.get(suite.name)
+
+        if runtime is None:
+            for box in suite:
+                box_runtime = self(box)
+                if box_runtime is not None:
+                    runtime = (runtime or float()) + box_runtime
+
+        return runtime
+
+    def __call__(self, obj):
+        if isinstance(obj, CaseBox):
+            return self.of_box(obj)
+
+        if isinstance(obj, Suite):
+            return self.of_suite(obj)
+
+        return self.of_case(obj)
+
+
+def runtime_weight(runtimes):
+    def weight(obj):
+        runtime = runtimes(obj)
+        return runtimes.default(obj) if runtime is None else runtime
+
+    return weight
+
+
+def longest_first(runtimes):
+    """
+    Sort suites or cases of suite in place by runtime from previous runs.
+    Long suite which started last is making long tail of run,
+    so longest of them are going first. Unknown objects are getting
+    mean runtime of known ones.
+    """
+    get_runtime = runtime_weight(runtimes)
+
+    def schedule(lst):
+        lst.sort(key=get_runtime, reverse=True)
+
+    return schedule
+
+
+def failed_first(suite_names, keys):
+    """
+    Sort suites or cases of suite in place, failed ones of last run
+    are going first. Sort is stable, so order of others is kept.
+    """
+    def is_failed(obj):
+        if isinstance(obj, Suite):
+            return obj.name in suite_names
+
+        if isinstance(obj, CaseBox):
+            return any(case_key(case) in keys for case in obj)
+
+        return case_key(obj) in keys
+
+    def schedule(lst):
+        lst.sort(key=lambda obj: not is_failed(obj))
+
+    return schedule
+
+
+def partition(items, count, weight, key):
+    """
+    Split items to count partitions with nearly equal sum of weights.
+    Greedy way: heaviest item is going to lightest partition.
+    Result depends on keys and weights only, order of items
+    is not matter, so it's the same on each machine.
+    """
+    loads = [float()] * count
+    partitions = [[] for _ in range(count)]
+
+    for item in sorted(items, key=lambda i: (-weight(i), key(i))):
+        index = loads.index(min(loads))
+        loads[index] += weight(item)
+        partitions[index].append(item)
+
+    return partitions
+
+
+def count_weight(obj):
+    if isinstance(obj, Suite):
+        return sum(len(box) for box in obj)
+
+    if isinstance(obj, CaseBox):
+        return len(obj)
+
+    return 1
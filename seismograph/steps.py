@@ -7,9 +7,10 @@ from functools import wraps
 from . import loader
 from . import runnable
 from .utils import pyv
+from .utils.common import measure_time
 
 
-STEP_ATTRIBUTE_NAME = '__step__'
+STEP_ATTRIBUTE_NAME = loader.STEP_ATTRIBUTE_NAME
 STEP_DOC_ATTRIBUTE_NAME = '__doc__'
 STEP_WEIGHT_ATTRIBUTE_NAME = '__weight__'
 STEPS_HISTORY_ATTRIBUTE_NAME = '__history__'
@@ -17,6 +18,7 @@ CURRENT_STEP_ATTRIBUTE_NAME = '__current_step__'
 CURRENT_FLOW_ATTRIBUTE_NAME = '__current_flow__'
 STEP_BY_STEP_ATTRIBUTE_NAME = '__step_by_step__'
 STEPS_STORAGE_ATTRIBUTE_NAME = '__step_methods__'
+STEPS_RUNTIME_ATTRIBUTE_NAME = '__steps_runtime__'
 
 
 def step(num, doc=None, performer=None, for_flows=None):
@@ -84,6 +86,10 @@ def get_case_history(case):
     return getattr(case, STEPS_HISTORY_ATTRIBUTE_NAME)
 
 
+def get_steps_runtime(case):
+    return getattr(case, STEPS_RUNTIME_ATTRIBUTE_NAME, None)
+
+
 def _create_history_line(method):
     return u'{}. {}'.format(
         get_step_num(method),
@@ -135,6 +141,8 @@ def _run_step(case, method, flow=None):
     if case.config.STEPS_LOG:
         case.log(_step_log(case, method, flow))
 
+    timer = measure_time()
+
     try:
         if flow is not None:
             method(case, flow)
@@ -143,6 +151,10 @@ def _run_step(case, method, flow=None):
     except BaseException:
         runnable.stopped_on(case, pyv.get_func_name(method))
         raise
+    finally:
+        getattr(case, STEPS_RUNTIME_ATTRIBUTE_NAME).append(
+            (pyv.get_func_name(method), timer()),
+        )
 
 
 def _call_to_method(case, method, *args, **kwargs):
@@ -182,6 +194,8 @@ def _make_run_test():
     def run_test(self):
         run_test.__doc__ = self.__doc__
 
+        setattr(self, STEPS_RUNTIME_ATTRIBUTE_NAME, [])
+
         if self.__flows__:
 
             for flow in self.__flows__:
@@ -237,17 +251,10 @@ class CaseMeta(type):
     def __new__(mcs, name, bases, dct):
         cls = type.__new__(mcs, name, bases, dct)
 
-        steps = []
-
-        attributes = (
-            a for a in dir(cls)
-            if not a.startswith('_')
-        )
-
-        for atr in attributes:
-            method = getattr(cls, atr, None)
-            if hasattr(method, STEP_ATTRIBUTE_NAME):
-                steps.append(method)
+        steps = [
+            getattr(cls, atr)
+            for atr in loader.get_class_metadata(cls).step_names
+        ]
 
         if steps:
             steps.sort(
@@ -261,4 +268,6 @@ class CaseMeta(type):
             setattr(cls, CURRENT_FLOW_ATTRIBUTE_NAME, 'Without flows')
             setattr(cls, loader.DEFAULT_TEST_NAME, _make_run_test())
 
+            loader.reset_class_metadata(cls)
+
         return cls
@@ -2,12 +2,16 @@
 
 import logging
 import traceback
+from itertools import groupby
+from collections import OrderedDict
 from types import FunctionType
+from contextlib import contextmanager
 
 from . import case
 from . import reason
 from . import loader
 from . import runnable
+from . import fixtures
 from . import extensions
 from .utils.common import measure_time
 from .utils.common import call_to_chain
@@ -133,6 +137,9 @@ class SuiteContext(runnable.ContextOfRunnableObject):
 
     def install_extensions(self):
         for ext_name in self.__require:
+            if fixtures.is_fixture(ext_name):
+                # fixtures are created on request
+                continue
             if ext_name not in self.__extensions:
                 self.__extensions[ext_name] = extensions.get(ext_name)
 
@@ -291,7 +298,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             try:
                 self.__context.on_run(self)
 
-                with self.__context(self):
+                with fixtures.suite_scope(self.name), self.__context(self):
                     group(result_proxy)
             except ALLOW_RAISED_EXCEPTIONS:
                 raise
@@ -383,12 +390,18 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             else:
                 case_classes = self.__case_classes
 
+        if self.config.LAZY_CASES:
+            case_factory = case.CaseDescriptor
+        else:
+            case_factory = None
+
         for cls in case_classes:
             self.__case_instances.extend(
                 loader.load_tests_from_case(
                     cls,
                     config=self.config,
                     method_name=test_name,
+                    case_factory=case_factory,
                     box_class=self.__case_box_class__,
                 ),
             )
@@ -482,6 +495,9 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         if name not in self.__context.require:
             raise ExtensionNotRequired(name)
 
+        if fixtures.is_fixture(name):
+            return fixtures.get(name, suite_name=self.name)
+
         return self.__context.extensions.get(name)
 
     def mount_to(self, program):
@@ -512,10 +528,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                 'cls': case_class,
                 'tests': dict(
                     (atr, getattr(case_class, atr))
-                    for atr in dir(case_class)
-                    if atr.startswith(loader.TEST_NAME_PREFIX)
-                    or
-                    atr == loader.DEFAULT_TEST_NAME,
+                    for atr in loader.get_class_metadata(case_class).test_names
                 ),
             }
 
@@ -572,6 +585,8 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             if assertion_class:
                 setattr(_class, '__assertion_class__', assertion_class)
 
+            loader.reset_class_metadata(_class)
+
             self.__case_classes.append(
                 _class.mount_to(
                     self,
@@ -619,4 +634,84 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         if shuffle:
             shuffle(self.__case_instances)
 
+        if self.config.GROUP_FIXTURES:
+            self.group_cases()
+
         self.__is_build = True
+
+    def group_cases(self):
+        """
+        Cases of one class are going to one box, so setup and
+        teardown of class are called once and teardown is called
+        after the last case of class. Classes which are requiring
+        the same extensions are going one after another.
+        Order of first appearance is kept, so it's deterministic.
+        """
+        classes = OrderedDict()
+
+        for box in self.__case_instances:
+            for c in box:
+                classes.setdefault(case.get_case_class(c), []).append(c)
+
+        groups = OrderedDict()
+
+        for case_class, cases in classes.items():
+            groups.setdefault(case.get_require_key(case_class), []).append(
+                self.__case_box_class__(cases),
+            )
+
+        self.__case_instances = [
+            box for boxes in groups.values() for box in boxes
+        ]
+
+    def filter_cases(self, func):
+        self.__case_instances = [
+            box for box in self.__case_instances if func(box)
+        ]
+
+    def split_cases(self, count):
+        """
+        Split cases of suite to parts with nearly equal count
+        of cases. Flat list of cases is cut to contiguous ranges,
+        so order is kept, but box can be split between two parts.
+        Each piece of such box is a box of its own part, so setup
+        and teardown of class are called in both of them.
+        """
+        cases = [
+            (i, c) for i, box in enumerate(self.__case_instances) for c in box
+        ]
+        size, rest = divmod(len(cases), count)
+
+        parts = []
+        start = 0
+
+        for i in range(count):
+            stop = start + size + (1 if i < rest else 0)
+            parts.append(
+                [
+                    self.__case_box_class__([c for _, c in group])
+                    for _, group in groupby(cases[start:stop], lambda t: t[0])
+                ],
+            )
+            start = stop
+
+        return parts
+
+    @contextmanager
+    def shard(self, index, count):
+        """
+        Suite is running only part of cases inside context.
+        Flags of setup and teardown class are reset, so
+        each part is calling them on its own.
+        """
+        case_instances = self.__case_instances
+        self.__case_instances = self.split_cases(count)[index]
+
+        for box in self.__case_instances:
+            for c in box:
+                case.reset_class_proxies(c)
+
+        try:
+            yield self
+        finally:
+            self.__case_instances = case_instances
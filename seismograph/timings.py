@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""
+History of runtimes of suites, cases and steps between runs
+"""
+
+import time
+import logging
+import sqlite3
+from contextlib import contextmanager
+
+from .schedule import Runtimes
+
+
+logger = logging.getLogger(__name__)
+
+
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+KIND_CASE = 'case'
+KIND_STEP = 'step'
+KIND_SUITE = 'suite'
+
+STATUS_SKIP = 'skip'
+STATUS_FAIL = 'fail'
+STATUS_ERROR = 'error'
+STATUS_SUCCESS = 'success'
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS runs ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+    'started REAL NOT NULL)',
+
+    'CREATE TABLE IF NOT EXISTS timings ('
+    'run_id INTEGER NOT NULL, '
+    'kind TEXT NOT NULL, '
+    'name TEXT NOT NULL, '
+    'status TEXT, '
+    'runtime REAL NOT NULL)',
+
+    'CREATE INDEX IF NOT EXISTS timings_by_name '
+    'ON timings (kind, name, run_id)',
+)
+
+
+def is_timings_db(file_path):
+    with open(file_path, 'rb') as fp:
+        return fp.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+def case_name(xunit_data):
+    return u'{}.{}'.format(xunit_data.class_name, xunit_data.method_name)
+
+
+def percentile(values, percent):
+    """
+    Percentile with linear interpolation between closest ranks
+    """
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = (len(values) - 1) * percent / 100.0
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class TimingsStore(object):
+    """
+    Append only storage of runtimes in sqlite database.
+    Each of runs is adding new rows only, so history
+    of runtimes is available for each of cases.
+    """
+
+    def __init__(self, file_path):
+        self.__file_path = file_path
+
+        with self.cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @contextmanager
+    def cursor(self):
+        connection = sqlite3.connect(self.__file_path)
+
+        try:
+            yield connection.cursor()
+            connection.commit()
+        finally:
+            connection.close()
+
+    def iter_rows(self, result):
+        for status, storage in (
+                (STATUS_SUCCESS, result.successes),
+                (STATUS_SKIP, result.skipped),
+                (STATUS_FAIL, result.failures),
+                (STATUS_ERROR, result.errors)):
+            for _, xunit_data in storage:
+                name = case_name(xunit_data)
+
+                yield KIND_CASE, name, status, xunit_data.runtime
+
+                for step_name, runtime in xunit_data.steps or []:
+                    yield KIND_STEP, u'{}.{}'.format(name, step_name), status, runtime
+
+        for proxy in result.proxies:
+            yield KIND_SUITE, proxy.name, None, proxy.get_state().runtime
+
+    def save_result(self, result):
+        logger.debug(
+            'Save timings of result to "{}"'.format(self.__file_path),
+        )
+
+        with self.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO runs (started) VALUES (?)', (time.time(), ),
+            )
+            run_id = cursor.lastrowid
+
+            cursor.executemany(
+                'INSERT INTO timings (run_id, kind, name, status, runtime) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (
+                    (run_id, kind, name, status, runtime)
+                    for kind, name, status, runtime in self.iter_rows(result)
+                ),
+            )
+
+        return run_id
+
+    def runtimes(self, name, kind=KIND_CASE, last=None):
+        """
+        Runtimes of object from last runs, the newest is first
+        """
+        query = (
+            'SELECT timings.runtime FROM timings '
+            'WHERE kind = ? AND name = ? ORDER BY run_id DESC'
+        )
+        params = (kind, name)
+
+        if last:
+            query += ' LIMIT ?'
+            params += (last, )
+
+        with self.cursor() as cursor:
+            return [row[0] for row in cursor.execute(query, params)]
+
+    def percentile(self, name, percent, kind=KIND_CASE, last=None):
+        return percentile(
+            self.runtimes(name, kind=kind, last=last), percent,
+        )
+
+    def trend(self, name, kind=KIND_CASE, last=10):
+        """
+        Pairs of start time of run and runtime, the oldest is first
+        """
+        with self.cursor() as cursor:
+            rows = cursor.execute(
+                'SELECT runs.started, timings.runtime FROM timings '
+                'JOIN runs ON runs.id = timings.run_id '
+                'WHERE kind = ? AND name = ? ORDER BY run_id DESC LIMIT ?',
+                (kind, name, last),
+            )
+            return list(reversed(rows.fetchall()))
+
+    def slowest(self, count=10, kind=KIND_CASE, last=1):
+        """
+        Names with mean runtime for last runs, the slowest is first
+        """
+        with self.cursor() as cursor:
+            rows = cursor.execute(
+                'SELECT name, AVG(runtime) FROM timings '
+                'WHERE kind = ? AND run_id IN '
+                '(SELECT id FROM runs ORDER BY id DESC LIMIT ?) '
+                'GROUP BY name ORDER BY 2 DESC, name LIMIT ?',
+                (kind, last, count),
+            )
+            return rows.fetchall()
+
+    def mean_runtimes(self, kind, last=5):
+        with self.cursor() as cursor:
+            rows = cursor.execute(
+                'SELECT name, AVG(runtime) FROM timings '
+                'WHERE kind = ? AND run_id IN '
+                '(SELECT id FROM runs ORDER BY id DESC LIMIT ?) '
+                'GROUP BY name',
+                (kind, last),
+            )
+            return dict(rows.fetchall())
+
+    def load_runtimes(self, last=5):
+        return Runtimes(
+            suites=self.mean_runtimes(KIND_SUITE, last=last),
+            cases=self.mean_runtimes(KIND_CASE, last=last),
+        )
@@ -27,3 +27,17 @@ class MPSupportedValue(object):
 
     def set(self, value):
         self._value = value
+
+
+class SharedMemory(object):
+    """
+    Creates values in shared memory without server process.
+    Has the same interface as multiprocessing manager
+    for "support_mp" methods of runnable objects and state.
+    """
+
+    @staticmethod
+    def Value(typecode, value):
+        from multiprocessing.sharedctypes import RawValue
+
+        return RawValue(typecode, value)
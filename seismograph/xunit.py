@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import os
 import json
 import pickle
 import marshal
 
 from .utils import pyv
+from .reason import LazyReason
 
 
 XML_VERSION = '1.0'
@@ -15,6 +17,16 @@ ROUND_RUNTIME = 3
 
 class XUnitData(object):
 
+    __slots__ = (
+        '__steps',
+        '__reason',
+        '__runtime',
+        '__exc_type',
+        '__class_name',
+        '__exc_message',
+        '__method_name',
+    )
+
     def __init__(self,
                  exc=None,
                  reason=None,
@@ -22,7 +34,8 @@ class XUnitData(object):
                  exc_type=None,
                  class_name=None,
                  method_name=None,
-                 exc_message=None):
+                 exc_message=None,
+                 steps=None):
         if exc:
             self.parse_exc(exc)
         else:
@@ -33,6 +46,7 @@ class XUnitData(object):
         self.__runtime = runtime
         self.__class_name = class_name
         self.__method_name = method_name
+        self.__steps = steps
 
     @classmethod
     def from_dict(cls, dct):
@@ -82,16 +96,37 @@ class XUnitData(object):
     def method_name(self):
         return self.__method_name
 
+    @property
+    def steps(self):
+        return self.__steps
+
     def to_dict(self):
+        reason = self.__reason
+
+        if isinstance(reason, LazyReason):
+            reason = reason.text
+
         return {
-            'reason': self.__reason,
+            'reason': reason,
             'runtime': self.__runtime,
             'exc_type': self.__exc_type,
             'class_name': self.__class_name,
             'exc_message': self.__exc_message,
             'method_name': self.__method_name,
+            'steps': self.__steps,
         }
 
+    def intern(self, table):
+        """
+        Short texts which are repeating between records
+        are replaced by one object of intern table.
+        """
+        self.__exc_type = table(self.__exc_type)
+        self.__exc_message = table(self.__exc_message)
+
+        if not isinstance(self.__reason, LazyReason):
+            self.__reason = table(self.__reason)
+
     def parse_exc(self, exc):
         self.__exc_type = '{}.{}'.format(
             exc.__class__.__module__, exc.__class__.__name__,
@@ -144,82 +179,80 @@ def to_xml_tag(tag_name, contains, **attributes):
         tag_name, dict_to_tag_attributes(attributes))
 
 
-def create_xml_document(result):
-    def render_result_proxy(result_proxy):
-        cases_report = []
-
-        for _, xunit_data in result_proxy.successes:
-            cases_report.append(
-                to_xml_tag('testcase', None,
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        for _, xunit_data in result_proxy.skipped:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('skipped',
-                                      cdata(xunit_data.reason),
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        for _, xunit_data in result_proxy.failures:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('failure',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        for _, xunit_data in result_proxy.errors:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('error',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        state = result_proxy.get_state()
-
-        return to_xml_tag('testsuite',
-                          u''.join(cases_report),
-                          name=result_proxy.name,
-                          tests=state.tests,
-                          time=state.runtime,
-                          skip=state.skipped,
-                          errors=state.errors,
-                          failures=state.failures,
-                          )
-
-    data = u''.join(
+def render_testsuite(result_proxy):
+    cases_report = []
+
+    for _, xunit_data in result_proxy.successes:
+        cases_report.append(
+            to_xml_tag('testcase', None,
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       ),
+        )
+
+    for _, xunit_data in result_proxy.skipped:
+        cases_report.append(
+            to_xml_tag('testcase',
+                       to_xml_tag('skipped',
+                                  cdata(xunit_data.reason),
+                                  ),
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       ),
+        )
+
+    for _, xunit_data in result_proxy.failures:
+        cases_report.append(
+            to_xml_tag('testcase',
+                       to_xml_tag('failure',
+                                  cdata(xunit_data.reason),
+                                  type=xunit_data.exc_type,
+                                  message=xunit_data.exc_message,
+                                  ),
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       ),
+        )
+
+    for _, xunit_data in result_proxy.errors:
+        cases_report.append(
+            to_xml_tag('testcase',
+                       to_xml_tag('error',
+                                  cdata(xunit_data.reason),
+                                  type=xunit_data.exc_type,
+                                  message=xunit_data.exc_message,
+                                  ),
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       ),
+        )
+
+    state = result_proxy.get_state()
+
+    return to_xml_tag('testsuite',
+                      u''.join(cases_report),
+                      name=result_proxy.name,
+                      tests=state.tests,
+                      time=state.runtime,
+                      skip=state.skipped,
+                      errors=state.errors,
+                      failures=state.failures,
+                      )
+
+
+def render_testsuites(result, contains):
+    return u''.join(
         (
             u'<?xml version="{version}" encoding="{encoding}"?>'.format(
                 version=XML_VERSION,
                 encoding=XML_ENCODING,
             ),
             to_xml_tag('testsuites',
-                       u''.join(
-                           map(render_result_proxy, result.proxies),
-                       )
-                       if result.proxies else render_result_proxy(result),
+                       contains,
                        name=result.name,
                        tests=result.current_state.tests,
                        time=result.current_state.runtime,
@@ -230,7 +263,84 @@ def create_xml_document(result):
         ),
     )
 
+
+def create_xml_document(result):
+    data = render_testsuites(
+        result,
+        u''.join(
+            map(render_testsuite, result.proxies),
+        )
+        if result.proxies else render_testsuite(result),
+    )
+
     if pyv.IS_PYTHON_2:
         return data.encode('utf-8')
 
     return data
+
+
+class XUnitStreamWriter(object):
+    """
+    Each of testsuite tags is written to body file right after
+    proxy of suite was closed, so memory is not growing with count
+    of cases and finished suites are on disk if process has died.
+    Report is assembled from body file on close with totals
+    and the same order of suites as create_xml_document has.
+    """
+
+    BODY_FILE_SUFFIX = '.part'
+    CONTAINS_MARKER = u'<!--testsuites-->'
+
+    def __init__(self, file_path):
+        self.__file_path = file_path
+        self.__body_path = file_path + self.BODY_FILE_SUFFIX
+
+        self.__offsets = {}
+        self.__body = open(self.__body_path, 'wb')
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    def write_suite(self, result_proxy):
+        start = self.__body.tell()
+
+        self.__body.write(
+            render_testsuite(result_proxy).encode('utf-8'),
+        )
+        self.__body.flush()
+
+        self.__offsets[id(result_proxy)] = (start, self.__body.tell() - start)
+
+    def copy_suite(self, result_proxy, body, fp):
+        if id(result_proxy) not in self.__offsets:
+            fp.write(render_testsuite(result_proxy).encode('utf-8'))
+            return
+
+        start, size = self.__offsets[id(result_proxy)]
+
+        body.seek(start)
+        fp.write(body.read(size))
+
+    def close(self, result):
+        self.__body.close()
+
+        if result.proxies:
+            contains = self.CONTAINS_MARKER
+        else:
+            contains = render_testsuite(result)
+
+        head, _, tail = render_testsuites(result, contains).partition(
+            self.CONTAINS_MARKER,
+        )
+
+        with open(self.__file_path, 'wb') as fp:
+            fp.write(head.encode('utf-8'))
+
+            with open(self.__body_path, 'rb') as body:
+                for result_proxy in result.proxies:
+                    self.copy_suite(result_proxy, body, fp)
+
+            fp.write(tail.encode('utf-8'))
+
+        os.remove(self.__body_path)
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import inspect
+import logging
 from collections import OrderedDict
 
 import seismograph
 from seismograph import case
 from seismograph import xunit
+from seismograph import loader
 from seismograph import result
 from seismograph.utils import pyv
 from seismograph.steps import step
@@ -475,6 +477,30 @@ class TestBasicRunCase(RunCaseTestCaseMixin, BaseTestCase):
         self.assertIsInstance(self.case.log, result.Console.ChildConsole)
 
 
+class TestResetResult(RunCaseTestCaseMixin, BaseTestCase):
+
+    def runTest(self):
+        other_case = self.CaseClass('test', config=self.config)
+        other_case(self.result)
+
+        xunit_data = xunit.XUnitData(runtime=1.0)
+
+        self.assertTrue(self.result.reset_success(self.case, xunit_data))
+        self.assertIs(self.result.get_success_by(self.case), xunit_data)
+        self.assertFalse(self.result.reset_fail(self.case, xunit_data))
+        self.assertIsNone(self.result.get_fail_by(self.case))
+
+        self.assertEqual(
+            [c for c, _ in self.result.successes],
+            [other_case, self.case],
+        )
+        self.assertIs(self.result.successes[-1][1], xunit_data)
+        self.assertEqual(
+            self.result.successes.runtime,
+            self.result.get_success_by(other_case).runtime + 1.0,
+        )
+
+
 class TestFailCase(RunCaseTestCaseMixin, BaseTestCase):
 
     class CaseClass(case_factory.FakeCase):
@@ -502,6 +528,71 @@ class TestFailCase(RunCaseTestCaseMixin, BaseTestCase):
         )
 
 
+capture_buffer = result.LogBuffer()
+capture_logger = logging.getLogger('tests.case.capture')
+capture_logger.propagate = False
+capture_logger.setLevel(logging.INFO)
+capture_logger.addHandler(
+    result.CaptureHandler(logging.StreamHandler(), capture_buffer),
+)
+
+
+class TestLogCapture(RunCaseTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {
+        'LOG_CAPTURE_SIZE': 2,
+    }
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            for i in range(3):
+                capture_logger.info('record %s', i)
+            raise AssertionError('fail')
+
+    def run_case(self):
+        capture_logger.info('outside of case')
+
+        super(TestLogCapture, self).run_case()
+
+    def runTest(self):
+        _, xunit_data = self.result.failures[0]
+
+        self.assertIn(
+            u'Logging capture:\n\nrecord 1\nrecord 2\n', xunit_data.reason,
+        )
+        self.assertNotIn(u'record 0', xunit_data.reason)
+
+        self.assertEqual(len(capture_buffer), 1)
+        self.assertEqual(capture_buffer.getvalue(), u'outside of case\n')
+        capture_buffer.clear()
+
+
+class TestSpillReason(RunCaseTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {
+        'REASON_SPILL_SIZE': 10,
+    }
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            raise AssertionError('long message for spill')
+
+    def runTest(self):
+        _, xunit_data = self.result.failures[0]
+
+        self.assertTrue(xunit_data.reason.is_spilled)
+        self.assertIn('long message for spill', xunit_data.reason)
+        self.assertEqual(
+            xunit_data.to_dict()['reason'], pyv.unicode_string(xunit_data.reason),
+        )
+        self.assertEqual(
+            xunit.XUnitData.from_marshal(xunit_data.to_marshal()).reason,
+            xunit_data.reason,
+        )
+
+
 class TestErrorCase(RunCaseTestCaseMixin, BaseTestCase):
 
     class CaseClass(case_factory.FakeCase):
@@ -688,6 +779,48 @@ class TestRepeatMethod(RunCaseTestCaseMixin, BaseTestCase):
         self.assertEqual(self.case.counter, 5)
 
 
+class TestClassMetadata(BaseTestCase):
+
+    def runTest(self):
+        class CaseClass(case.Case):
+
+            def test_b(self):
+                pass
+
+            def test_a(self):
+                pass
+
+            @step(2, 'second')
+            def second(self):
+                pass
+
+            @step(1, 'first')
+            def first(self):
+                pass
+
+        metadata = loader.get_class_metadata(CaseClass)
+
+        self.assertIs(loader.get_class_metadata(CaseClass), metadata)
+        self.assertEqual(metadata.test_names, ('test', 'test_a', 'test_b'))
+        self.assertEqual(metadata.step_names, ('first', 'second'))
+        self.assertIsNone(metadata.flows)
+
+        case.flows(1, 2)(CaseClass)
+
+        self.assertIsNot(loader.get_class_metadata(CaseClass), metadata)
+        self.assertEqual(loader.get_class_metadata(CaseClass).flows, (1, 2))
+
+        class SubClass(CaseClass):
+
+            def test_c(self):
+                pass
+
+        self.assertEqual(
+            loader.get_class_metadata(SubClass).test_names,
+            ('test', 'test_a', 'test_b', 'test_c'),
+        )
+
+
 class TestStepByStepCase(RunCaseTestCaseMixin, BaseTestCase):
 
     class CaseClass(case_factory.FakeCase):
@@ -730,6 +863,12 @@ class TestStepByStepCase(RunCaseTestCaseMixin, BaseTestCase):
             2,
         )
 
+        _, xunit_data = self.result.successes[0]
+        self.assertEqual(
+            [name for name, _ in xunit_data.steps],
+            ['step_one', 'step_two'],
+        )
+
 
 class TestFLowsOnStepByStepCase(RunCaseTestCaseMixin, BaseTestCase):
 
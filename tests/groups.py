@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import signal
+
+from seismograph import (
+    case,
+    suite,
+    runnable,
+    exceptions,
+)
+from seismograph.utils.mp import SharedMemory
+from seismograph.groups import multiprocessing as mp
+
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+def create_suite(config, name, *tests):
+    """
+    Case class is mounted once only, so classes
+    are created from mixins of tests for each suite.
+    """
+    suite_inst = suite.Suite(name)
+    suite_inst.__mount_data__ = suite.MountData(config)
+
+    for test_class in tests:
+        suite_inst.register(
+            type(test_class.__name__, (test_class, case.Case), {}),
+        )
+
+    suite_inst.build()
+
+    return suite_inst
+
+
+def get_counts(result):
+    state = result.current_state
+
+    return dict(
+        tests=state.tests,
+        errors=state.errors,
+        failures=state.failures,
+        successes=state.successes,
+        skipped=state.skipped,
+    )
+
+
+class CaseOne(object):
+
+    def test(self):
+        pass
+
+    def test_two(self):
+        self.assertion.fail('fail')
+
+    def test_three(self):
+        pass
+
+
+class CaseTwo(object):
+
+    def test(self):
+        pass
+
+    def test_two(self):
+        raise ValueError('error')
+
+    @case.skip('skip')
+    def test_three(self):
+        pass
+
+
+class PoolTestCaseMixin(ResultTestCaseMixin):
+
+    __config_options__ = dict(
+        ASYNC_SUITES=2,
+        MULTIPROCESSING=True,
+        MULTIPROCESSING_POOL=True,
+        MULTIPROCESSING_TIMEOUT=30.0,
+    )
+
+    def setUp(self):
+        super(PoolTestCaseMixin, self).setUp()
+
+        mp.import_mp()
+
+    def create_pool(self, *suites):
+        return mp.MultiprocessingPool(self.result, self.config, suites=suites)
+
+    def serve(self, *suites):
+        with self.create_pool(*suites) as pool:
+            pool.serve()
+
+        return pool
+
+
+class TestMultiprocessingPool(PoolTestCaseMixin, BaseTestCase):
+
+    def test_collect_results(self):
+        pool = self.serve(
+            create_suite(self.config, 'one', CaseOne),
+            create_suite(self.config, 'two', CaseTwo),
+        )
+
+        self.assertEqual(
+            get_counts(self.result),
+            dict(tests=6, errors=1, failures=1, successes=3, skipped=1),
+        )
+        self.assertEqual(
+            sorted(p.name for p in self.result.proxies), ['one', 'two'],
+        )
+
+        runnable_object, xunit_data = self.result.errors[0]
+
+        self.assertIsInstance(runnable_object, CaseTwo)
+        self.assertEqual(xunit_data.method_name, 'test_two')
+
+        self.assertEqual(len(pool.workers), 2)
+        self.assertFalse([p for p in pool.workers if p.is_alive()])
+        self.assertEqual([p.exitcode for p in pool.workers], [0, 0])
+
+    def test_stop_on_terminate(self):
+        pool = self.create_pool()
+        default_handler = signal.getsignal(signal.SIGTERM)
+
+        with self.assertRaises(exceptions.EmergencyStop):
+            with pool.stop_on_terminate():
+                os.kill(os.getpid(), signal.SIGTERM)
+                time.sleep(1)
+
+        self.assertIs(signal.getsignal(signal.SIGTERM), default_handler)
+
+    def test_partial_report_on_terminate(self):
+        class CaseTerminate(object):
+
+            def test(self):
+                # result of suite "one" is merged by parent at the moment
+                time.sleep(0.5)
+                os.kill(os.getppid(), signal.SIGTERM)
+                time.sleep(30)
+
+        self.config.ASYNC_SUITES = 1
+
+        pool = self.create_pool(
+            create_suite(self.config, 'one', CaseOne),
+            create_suite(self.config, 'terminate', CaseTerminate),
+        )
+
+        with self.assertRaises(exceptions.EmergencyStop):
+            with pool:
+                pool.serve()
+
+        self.assertEqual([p.name for p in self.result.proxies], ['one'])
+        self.assertEqual(self.result.current_state.tests, 3)
+        self.assertFalse([p for p in pool.workers if p.is_alive()])
+
+    def test_stop_other_workers(self):
+        class CaseSlow(object):
+
+            def test(self):
+                time.sleep(0.1)
+
+        for i in range(10):
+            setattr(CaseSlow, 'test_{}'.format(i), CaseSlow.test)
+
+        class CaseFail(object):
+
+            def test(self):
+                self.assertion.fail('fail')
+
+        self.config.STOP = True
+
+        self.serve(
+            create_suite(self.config, 'fail', CaseFail),
+            create_suite(self.config, 'slow', CaseSlow),
+        )
+
+        self.assertTrue(self.result.current_state.should_stop)
+        self.assertEqual(self.result.current_state.failures, 1)
+        self.assertLess(self.result.current_state.successes, 5)
+
+
+class CaseExit(object):
+
+    def test(self):
+        os._exit(3)
+
+
+class TestDeadWorker(PoolTestCaseMixin, BaseTestCase):
+    """
+    Dead worker is replaced by new one and
+    suite of lost task is reported as error.
+    """
+
+    def run_pool(self, **options):
+        for name, value in options.items():
+            setattr(self.config, name, value)
+
+        self.make_result()
+        pool = self.serve(
+            create_suite(self.config, 'exit', CaseExit),
+            create_suite(self.config, 'one', CaseOne),
+        )
+
+        self.assertEqual(
+            get_counts(self.result),
+            dict(tests=4, errors=1, failures=1, successes=2, skipped=0),
+        )
+        self.assertFalse(self.result.current_state.was_success)
+
+        runnable_object, xunit_data = self.result.errors[0]
+
+        self.assertIsInstance(runnable_object, suite.Suite)
+        self.assertEqual(runnable_object.name, 'exit')
+        self.assertIn('exit code "3"', xunit_data.exc_message)
+
+        self.assertEqual([p.exitcode for p in pool.dead_workers], [3])
+        self.assertFalse([p for p in pool.workers if p.is_alive()])
+
+    def test_one_worker(self):
+        self.run_pool(ASYNC_SUITES=1)
+
+    def test_two_workers(self):
+        self.run_pool(ASYNC_SUITES=2)
+
+    def test_stream(self):
+        self.run_pool(ASYNC_SUITES=1, MULTIPROCESSING_STREAM=True)
+
+
+class TestMultiprocessingPoolModes(PoolTestCaseMixin, BaseTestCase):
+    """
+    Streaming and splitting of cases are merging result
+    by another way, but counts must be the same.
+    """
+
+    def get_counts(self, **options):
+        for name, value in options.items():
+            setattr(self.config, name, value)
+
+        self.make_result()
+        self.serve(
+            create_suite(self.config, 'one', CaseOne, CaseTwo),
+            create_suite(self.config, 'two', CaseTwo),
+        )
+
+        return (
+            get_counts(self.result),
+            dict((p.name, get_counts(p)) for p in self.result.proxies),
+        )
+
+    def runTest(self):
+        expected = self.get_counts()
+
+        self.assertEqual(expected[0]['tests'], 9)
+
+        for options in (
+                dict(MULTIPROCESSING_STREAM=True),
+                dict(MULTIPROCESSING_SPLIT_CASES=True),
+                dict(MULTIPROCESSING_STREAM=True, MULTIPROCESSING_SPLIT_CASES=True),
+        ):
+            self.assertEqual(self.get_counts(**options), expected, options)
+
+
+class TestMPResult(ResultTestCaseMixin, BaseTestCase):
+
+    def runTest(self):
+        suite_inst = create_suite(self.config, 'packed', CaseOne, CaseTwo)
+        suite_inst(self.result)
+
+        packed = mp.MPResult.pack_proxies(self.result.proxies)
+
+        self.make_result()
+
+        mp_result = mp.MPResult(self.result)
+        mp_result.match(suite_inst)
+        mp_result.merge(packed)
+
+        self.assertEqual(len(self.result.proxies), 1)
+        self.assertEqual(self.result.proxies[0].name, 'packed')
+        self.assertEqual(
+            get_counts(self.result),
+            dict(tests=6, errors=1, failures=1, successes=3, skipped=1),
+        )
+
+        runnable_object, xunit_data = self.result.failures[0]
+
+        self.assertIsInstance(runnable_object, CaseOne)
+        self.assertEqual(runnable.stopped_on(runnable_object), 'test_two')
+        self.assertEqual(xunit_data.method_name, 'test_two')
+        self.assertEqual(xunit_data.exc_message, 'fail')
+
+        runnable_object, _ = self.result.errors[0]
+
+        self.assertEqual(runnable.stopped_on(runnable_object), 'test_two')
+        self.assertEqual(
+            mp.MPResult.pack_proxies(self.result.proxies), packed,
+        )
+
+
+class TestSharedMemory(ResultTestCaseMixin, BaseTestCase):
+
+    def setUp(self):
+        super(TestSharedMemory, self).setUp()
+
+        mp.import_mp()
+
+    def test_value(self):
+        value = SharedMemory.Value('b', False)
+
+        def set_value():
+            value.value = True
+
+        process = mp.MPProcess(target=set_value)
+        process.start()
+        process.join()
+
+        self.assertTrue(value.value)
+
+    def test_should_stop(self):
+        self.result.support_mp(SharedMemory())
+
+        def stop():
+            self.result.current_state.should_stop = True
+
+        process = mp.MPProcess(target=stop)
+        process.start()
+        process.join()
+
+        self.assertEqual(process.exitcode, 0)
+        self.assertTrue(self.result.current_state.should_stop)
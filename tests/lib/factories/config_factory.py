@@ -7,22 +7,40 @@ class FakeConfig(object):
 
     def __init__(self):
         self.XUNIT_REPORT = None
+        self.XUNIT_STREAM = False
+        self.BINARY_REPORT = None
+        self.TIMINGS_DB = None
+        self.COMPACT_RESULT = False
+        self.REASON_SPILL_SIZE = None
+        self.EVENTS = None
         self.VERBOSE = False
         self.OUTPUT = None
         self.NO_CAPTURE = False
+        self.LOG_CAPTURE_SIZE = 1000
         self.SUITE_DETAIL = False
         self.TREE = False
         self.NO_COLOR = False
+        self.BUFFERED_CONSOLE = False
         self.STEPS_LOG = False
         self.FLOWS_LOG = False
         self.STEP_BY_STEP = False
         self.TESTS = []
+        self.DISCOVERY_CACHE = None
+        self.LAZY_CASES = False
+        self.GROUP_FIXTURES = False
         self.INCLUDE_SUITES_PATTERN = None
         self.EXCLUDE_SUITE_PATTERN = None
         self.STOP = False
         self.REPEAT = 0
         self.RANDOM = False
         self.RANDOM_SEED = time.time()
+        self.RUNTIMES_FROM = None
+        self.LAST_FAILED = False
+        self.FAILED_FIRST = False
+        self.LAST_FAILED_CACHE = None
+        self.SHARD_COUNT = None
+        self.SHARD_INDEX = None
+        self.SHARD_CASES = False
         self.NO_SCRIPTS = False
         self.ASYNC_SUITES = 0
         self.ASYNC_TESTS = 0
@@ -30,6 +48,9 @@ class FakeConfig(object):
         self.GEVENT = False
         self.THREADING = False
         self.MULTIPROCESSING = False
+        self.MULTIPROCESSING_POOL = False
+        self.MULTIPROCESSING_STREAM = False
+        self.MULTIPROCESSING_SPLIT_CASES = False
         self.PDB = False
         self.FIRST_FLOW_ONLY = False
         self.SPLIT_FLOWS = False
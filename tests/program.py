@@ -1,6 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import os
+import sys
+import time
+import shutil
 import inspect
+import pickle
+import tempfile
+from collections import (
+    Counter,
+    OrderedDict,
+    defaultdict,
+)
 
 try:
     from StringIO import StringIO
@@ -11,11 +22,17 @@ import seismograph
 from seismograph import case
 from seismograph import suite
 from seismograph import config
+from seismograph import loader
 from seismograph import result
 from seismograph import script
 from seismograph import program
 from seismograph.utils import pyv
+from seismograph import fixtures
+from seismograph import lastfailed
+from seismograph import discovery
+from seismograph import datastructures
 from seismograph import extensions
+from seismograph import exceptions
 
 from .lib.case import (
     BaseTestCase,
@@ -258,8 +275,11 @@ class TestSuiteIsValid(BaseTestCase):
 
 class TestShared(BaseTestCase):
 
+    def setUp(self):
+        self.program = program.Program()
+
     def test_shared_extension(self):
-        ex_tmp = extensions._TMP
+        ex_tmp = self.program.registry
 
         try:
             class TestExtension(object):
@@ -271,7 +291,7 @@ class TestShared(BaseTestCase):
             args = (1, 2, 3, 4, 5)
             kwargs = dict(a=1, b=2, c=3, d=4, e=5)
 
-            program.Program.shared_extension(
+            self.program.shared_extension(
                 'test_extension',
                 TestExtension,
                 args=args,
@@ -292,7 +312,7 @@ class TestShared(BaseTestCase):
             ex_tmp.pop('test_extension', None)
 
     def test_shared_singleton_extension(self):
-        ex_tmp = extensions._TMP
+        ex_tmp = self.program.registry
 
         try:
             class TestExtension(object):
@@ -304,7 +324,7 @@ class TestShared(BaseTestCase):
             args = (1, 2, 3, 4, 5)
             kwargs = dict(a=1, b=2, c=3, d=4, e=5)
 
-            program.Program.shared_extension(
+            self.program.shared_extension(
                 'test_extension',
                 TestExtension,
                 args=args,
@@ -325,17 +345,520 @@ class TestShared(BaseTestCase):
             ex_tmp.pop('test_extension', None)
 
     def test_shared_data(self):
-        ex_tmp = extensions._TMP
+        ex_tmp = self.program.registry
 
         try:
             data = dict(a=1, b=2, c=3, d=4, e=5)
-            program.Program.shared_data('test_data', data)
+            self.program.shared_data('test_data', data)
 
             self.assertIn('test_data', ex_tmp)
             self.assertEqual(ex_tmp['test_data'], data)
         finally:
             ex_tmp.pop('test_data', None)
 
+    def test_shared_data_is_frozen(self):
+        ex_tmp = self.program.registry
+
+        try:
+            data = dict(a=[1, 2], b=dict(c=3))
+            self.program.shared_data('test_data', data)
+
+            shared = ex_tmp.get('test_data')
+
+            self.assertIs(shared, ex_tmp.get('test_data'))
+            self.assertEqual(shared, data)
+
+            with self.assertRaises(TypeError):
+                shared['a'] = 1
+
+            with self.assertRaises(TypeError):
+                shared['a'].append(3)
+
+            with self.assertRaises(TypeError):
+                shared['b'].update(d=4)
+
+            copied = shared.copy()
+            copied['a'] = 1
+
+            self.assertEqual(copied['a'], 1)
+            self.assertEqual(shared['a'], [1, 2])
+        finally:
+            ex_tmp.pop('test_data', None)
+
+    def test_shared_data_copy(self):
+        ex_tmp = self.program.registry
+
+        try:
+            data = dict(a=[1, 2])
+            self.program.shared_data('test_data', data, copy=True)
+
+            shared = ex_tmp.get('test_data')
+            shared['a'].append(3)
+
+            self.assertIsNot(shared, ex_tmp.get('test_data'))
+            self.assertEqual(ex_tmp.get('test_data'), dict(a=[1, 2]))
+        finally:
+            ex_tmp.pop('test_data', None)
+
+
+    def test_shared_data_not_frozen_is_copied(self):
+        ex_tmp = self.program.registry
+
+        class Data(object):
+
+            def __init__(self):
+                self.items = [1, 2]
+
+        try:
+            self.program.shared_data('test_data', dict(a=Data()))
+
+            shared = ex_tmp.get('test_data')
+            shared['a'].items.append(3)
+
+            self.assertIsNot(shared, ex_tmp.get('test_data'))
+            self.assertEqual(ex_tmp.get('test_data')['a'].items, [1, 2])
+        finally:
+            ex_tmp.pop('test_data', None)
+
+
+class TestFreeze(BaseTestCase):
+
+    def assertFrozen(self, obj, *mutations):
+        for mutation in mutations:
+            with self.assertRaises(TypeError):
+                mutation(obj)
+
+    def test_list(self):
+        def set_slice(lst):
+            lst[0:1] = []
+
+        def del_slice(lst):
+            del lst[0:1]
+
+        def iadd(lst):
+            lst += [1]
+
+        def imul(lst):
+            lst *= 2
+
+        frozen = datastructures.freeze([3, 1, 2])
+
+        self.assertFrozen(
+            frozen,
+            set_slice,
+            del_slice,
+            iadd,
+            imul,
+            lambda lst: lst.__setitem__(0, 1),
+            lambda lst: lst.__delitem__(0),
+            lambda lst: lst.append(1),
+            lambda lst: lst.extend([1]),
+            lambda lst: lst.insert(0, 1),
+            lambda lst: lst.pop(),
+            lambda lst: lst.remove(1),
+            lambda lst: lst.reverse(),
+            lambda lst: lst.sort(),
+        )
+
+        if pyv.IS_PYTHON_3:
+            self.assertFrozen(frozen, lambda lst: lst.clear())
+
+        self.assertEqual(frozen, [3, 1, 2])
+
+    def test_dict(self):
+        frozen = datastructures.freeze(dict(a=1))
+
+        self.assertFrozen(
+            frozen,
+            lambda dct: dct.__setitem__('b', 2),
+            lambda dct: dct.__delitem__('a'),
+            lambda dct: setattr(dct, 'b', 2),
+            lambda dct: dct.clear(),
+            lambda dct: dct.pop('a'),
+            lambda dct: dct.popitem(),
+            lambda dct: dct.setdefault('b', 2),
+            lambda dct: dct.update(b=2),
+        )
+        self.assertEqual(frozen, dict(a=1))
+
+    def test_set(self):
+        def ior(st):
+            st |= set([3])
+
+        def iand(st):
+            st &= set([3])
+
+        def isub(st):
+            st -= set([1])
+
+        def ixor(st):
+            st ^= set([3])
+
+        frozen = datastructures.freeze(set([1, 2]))
+
+        self.assertIsInstance(frozen, set)
+        self.assertFrozen(
+            frozen,
+            ior,
+            iand,
+            isub,
+            ixor,
+            lambda st: st.add(3),
+            lambda st: st.discard(1),
+            lambda st: st.remove(1),
+            lambda st: st.pop(),
+            lambda st: st.clear(),
+            lambda st: st.update([3]),
+            lambda st: st.difference_update([1]),
+            lambda st: st.intersection_update([3]),
+            lambda st: st.symmetric_difference_update([3]),
+        )
+        self.assertEqual(frozen, set([1, 2]))
+
+    def test_ordered_dict(self):
+        data = OrderedDict((key, [key]) for key in 'zyxabc')
+        frozen = datastructures.freeze(data)
+
+        self.assertIsInstance(frozen, OrderedDict)
+        self.assertEqual(list(frozen), list('zyxabc'))
+        self.assertFrozen(
+            frozen,
+            lambda dct: dct.__setitem__('a', 1),
+            lambda dct: dct.popitem(),
+        )
+
+        copied = frozen.copy()
+        copied['a'] = 1
+
+        self.assertIs(copied.__class__, OrderedDict)
+        self.assertEqual(list(copied), list('zyxabc'))
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), data)
+
+    def test_subclass(self):
+        class List(list):
+            pass
+
+        frozen = datastructures.freeze(
+            datastructures.Context(a=List([1]), b=defaultdict(list)),
+        )
+
+        self.assertIsInstance(frozen, datastructures.Context)
+        self.assertIsInstance(frozen.a, List)
+        self.assertIs(frozen.b.default_factory, list)
+        self.assertFrozen(
+            frozen,
+            lambda ctx: setattr(ctx, 'c', 1),
+            lambda ctx: ctx.a.append(2),
+            lambda ctx: ctx.b['c'],
+        )
+
+    def test_unknown_object(self):
+        with self.assertRaises(exceptions.FreezeError):
+            datastructures.freeze(dict(a=[object()]))
+
+        with self.assertRaises(exceptions.FreezeError):
+            datastructures.freeze(Counter(a=1))
+
+
+class TestExtensionRegistry(BaseTestCase):
+
+    def setUp(self):
+        self.registry = extensions.ExtensionRegistry()
+
+    def test_singleton_lifetime(self):
+        self.registry.set(object, 'test_extension', singleton=True)
+
+        with self.registry.lifetime():
+            with self.registry.lifetime():
+                instance = self.registry.get('test_extension')
+
+            self.assertIs(self.registry.get('test_extension'), instance)
+
+        self.assertIsNot(self.registry.get('test_extension'), instance)
+
+    def test_parent(self):
+        parent = extensions.ExtensionRegistry()
+        parent.set(1, 'one', is_data=True)
+        parent.set(2, 'two', is_data=True)
+
+        self.registry = extensions.ExtensionRegistry(parent=parent)
+        self.registry.set(3, 'two', is_data=True)
+
+        self.assertIn('one', self.registry)
+        self.assertEqual(self.registry.get('one'), 1)
+        self.assertEqual(self.registry.get('two'), 3)
+        self.assertEqual(parent.get('two'), 2)
+
+        self.registry.pop('one')
+        self.registry.clear()
+
+        self.assertEqual(self.registry.get('two'), 2)
+        self.assertIn('one', parent)
+
+    def test_registry_of_program(self):
+        first = program.Program(suites_path=None, exit=False, stream=StringIO())
+        second = program.Program(suites_path=None, exit=False, stream=StringIO())
+        values = []
+
+        first.shared_data('test_data', 1)
+
+        self.assertIn('test_data', first.registry)
+        self.assertNotIn('test_data', second.registry)
+        self.assertIsNot(extensions.get_registry(), first.registry)
+
+        suite_inst = suite.Suite('test', require=['test_data'])
+
+        @suite_inst.register
+        class TestOne(case.Case):
+
+            def test(self):
+                values.append(self.ext('test_data'))
+
+        first.register_suite(suite_inst)
+
+        self.assertTrue(first())
+        self.assertEqual(values, [1])
+
+    def test_registry_of_threads(self):
+        from threading import Thread
+
+        registries = []
+
+        with extensions.use_registry(self.registry):
+            thread = Thread(target=lambda: registries.append(extensions.get_registry()))
+            thread.start()
+            thread.join()
+
+            self.assertIs(extensions.get_registry(), self.registry)
+
+        self.assertIsNot(extensions.get_registry(), self.registry)
+        self.assertIsNot(registries[0], self.registry)
+
+    def test_singleton_from_threads(self):
+        from threading import Thread
+
+        instances = []
+
+        def create():
+            time.sleep(0.01)
+            return object()
+
+        self.registry.set(create, 'test_extension', singleton=True)
+
+        threads = [
+            Thread(target=lambda: instances.append(self.registry.get('test_extension')))
+            for _ in range(5)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(id(i) for i in instances)), 1)
+
+    def test_not_found(self):
+        with self.assertRaises(exceptions.ExtensionNotFound):
+            self.registry.get('test_extension')
+
+    def test_repeated_run(self):
+        ex_registry = extensions.get_registry()
+        values = []
+
+        try:
+            # extensions out of programs are found by registry of each program
+            extensions.set(object, 'test_extension', singleton=True)
+
+            for _ in range(2):
+                suite_inst = suite.Suite('test', require=['test_extension'])
+
+                @suite_inst.register
+                class TestOne(case.Case):
+
+                    def test(self):
+                        values.append(self.ext('test_extension'))
+
+                    def test_two(self):
+                        values.append(self.ext('test_extension'))
+
+                program_inst = program.Program(exit=False, stream=StringIO())
+                program_inst.register_suite(suite_inst)
+
+                self.assertTrue(program_inst())
+        finally:
+            ex_registry.pop('test_extension')
+
+        self.assertEqual(len(values), 4)
+        self.assertIs(values[0], values[1])
+        self.assertIsNot(values[1], values[2])
+
+
+class TestSharedFixture(BaseTestCase):
+
+    def setUp(self):
+        self.story = []
+        self.program = program.Program(exit=False, stream=StringIO())
+
+        def factory(scope):
+            def create(**dependencies):
+                self.story.append(('create', scope, sorted(dependencies)))
+                return '{}-{}'.format(scope, len(self.story))
+            return create
+
+        def teardown(scope):
+            return lambda value: self.story.append(('teardown', scope, value))
+
+        for name, scope, require in (
+                ('db', fixtures.SESSION, None),
+                ('conn', fixtures.WORKER, ['db']),
+                ('data', fixtures.SUITE, ['db']),
+                ('tmp', fixtures.CASE, ['data']),
+        ):
+            self.program.shared_fixture(
+                name,
+                factory(scope),
+                scope=scope,
+                require=require,
+                teardown=teardown(scope),
+            )
+
+    def tearDown(self):
+        self.program = None
+
+    def test_scopes(self):
+        suite_inst = suite.Suite('test', require=['db', 'data', 'tmp'])
+        values = []
+
+        @suite_inst.register
+        class TestOne(case.Case):
+
+            def test(self):
+                values.append((self.ext('data'), self.ext('tmp')))
+
+            def test_two(self):
+                values.append((self.ext('data'), self.ext('tmp')))
+
+        self.program.register_suite(suite_inst)
+
+        self.assertTrue(self.program())
+        self.assertEqual(len(values), 2)
+        self.assertEqual(values[0][0], values[1][0])
+        self.assertNotEqual(values[0][1], values[1][1])
+        self.assertEqual(
+            [(action, scope) for action, scope, _ in self.story],
+            [
+                ('create', fixtures.SESSION),
+                ('create', fixtures.SUITE),
+                ('create', fixtures.CASE),
+                ('teardown', fixtures.CASE),
+                ('create', fixtures.CASE),
+                ('teardown', fixtures.CASE),
+                ('teardown', fixtures.SUITE),
+                ('teardown', fixtures.SESSION),
+            ],
+        )
+        self.assertEqual(self.story[1][2], ['db'])
+
+    def test_registry_of_program(self):
+        self.assertTrue(self.program.registry.is_fixture('db'))
+        self.assertFalse(fixtures.is_fixture('db'))
+
+        other = program.Program(exit=False, stream=StringIO())
+
+        with extensions.use_registry(other.registry):
+            self.assertFalse(fixtures.is_fixture('db'))
+
+        with extensions.use_registry(self.program.registry):
+            self.assertTrue(fixtures.is_fixture('db'))
+
+    def test_session_require(self):
+        with extensions.use_registry(self.program.registry):
+            self.assertEqual(fixtures.get_session_require(['tmp']), ['db'])
+            self.assertEqual(fixtures.get_session_require(['conn', 'ext']), ['db'])
+            self.assertEqual(fixtures.get_session_require(['ext']), [])
+
+    def test_session_of_required_fixture(self):
+        # "db" is required through "conn" of worker scope only
+        suite_inst = suite.Suite('test', require=['conn'])
+        created = []
+
+        @suite_inst.register
+        class TestOne(case.Case):
+
+            def test(self):
+                self.ext('conn')
+
+        def create(**dependencies):
+            created.append(os.getpid())
+            return 'db'
+
+        self.program.shared_fixture('db', create)
+        self.program.register_suite(suite_inst)
+        self.program.config.MULTIPROCESSING = True
+
+        self.assertTrue(self.program())
+        # value was created by this process before start of workers
+        self.assertEqual(created, [os.getpid()])
+
+    def test_create_from_threads(self):
+        from threading import Event
+        from threading import Thread
+
+        created = []
+        waiting = Event()
+        started = Event()
+
+        def create_one():
+            # fixture "two" is created while this one is waiting
+            waiting.set()
+            created.append(started.wait(5))
+            return 'one'
+
+        def create_two():
+            started.set()
+            created.append(True)
+            return 'two'
+
+        self.program.shared_fixture('one', create_one)
+        self.program.shared_fixture('two', create_two)
+        registry = self.program.registry
+
+        def get(name):
+            with extensions.use_registry(registry):
+                values.append(fixtures.get(name))
+
+        def teardown():
+            with extensions.use_registry(registry):
+                fixtures.teardown_process()
+
+        self.addCleanup(teardown)
+
+        values = []
+        threads = [
+            Thread(target=lambda n=name: get(n))
+            for name in ('one', 'two', 'one', 'two')
+        ]
+
+        threads[0].start()
+        waiting.wait(5)
+
+        for thread in threads[1:]:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(created, [True, True])
+        self.assertEqual(sorted(values), ['one', 'one', 'two', 'two'])
+
+    def test_wider_scope_can_not_require_narrower(self):
+        self.program.shared_fixture('db', lambda tmp: tmp, require=['tmp'])
+
+        with extensions.use_registry(self.program.registry):
+            with self.assertRaises(exceptions.FixtureError):
+                fixtures.get('db')
+
 
 class TestFullCycle(BaseTestCase):
 
@@ -380,3 +903,137 @@ class TestFullCycle(BaseTestCase):
             program_layer.calling_story,
             ['on_option_parser', 'on_config', 'on_init', 'on_run', 'on_setup', 'on_teardown'],
         )
+
+
+DISCOVERY_MODULE = '''
+import seismograph
+
+suite = seismograph.Suite('{name}')
+
+
+@suite.register
+class Case(seismograph.Case):
+    """Doc of case"""
+
+    def test(self):
+        pass
+'''
+
+
+class TestDiscoveryIndex(BaseTestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.path, 'index.json')
+        self.suites_path = os.path.join(self.path, 'suites')
+
+        os.mkdir(self.suites_path)
+
+        for name in ('discovery_one', 'discovery_two'):
+            with open(os.path.join(self.suites_path, name + '.py'), 'w') as fp:
+                fp.write(DISCOVERY_MODULE.format(name=name))
+
+        sys.path.append(self.suites_path)
+
+    def tearDown(self):
+        sys.path.remove(self.suites_path)
+        shutil.rmtree(self.path)
+
+    def load(self, suite_names=None):
+        index = discovery.DiscoveryIndex(self.index_path, self.suites_path)
+        suites = list(index.load(suite.Suite, suite_names=suite_names))
+        index.save()
+        return index, [s.name for s in suites]
+
+    def runTest(self):
+        _, names = self.load(suite_names={'discovery_two'})
+        self.assertEqual(sorted(names), ['discovery_one', 'discovery_two'])
+
+        index, names = self.load(suite_names={'discovery_two'})
+        self.assertEqual(names, ['discovery_two'])
+
+        _, names = self.load(suite_names=set())
+        self.assertEqual(names, [])
+
+        indexed = dict((s.name, s.get_map()) for s in index.suites())
+
+        self.assertEqual(sorted(indexed), ['discovery_one', 'discovery_two'])
+        self.assertEqual(indexed['discovery_one']['Case']['cls'].__doc__, 'Doc of case')
+        self.assertEqual(list(indexed['discovery_one']['Case']['tests']), ['test'])
+
+        _, names = self.load()
+        self.assertEqual(sorted(names), ['discovery_one', 'discovery_two'])
+
+
+class TestLastFailed(BaseTestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.path, 'last_failed')
+        self.story = []
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def run_program(self, fail, last_failed=False, names=('test_two', )):
+        suite_inst = suite.Suite('last_failed')
+        story = self.story
+
+        def create_test(name):
+            def test(self):
+                story.append(name)
+                self.assertion.false(fail)
+            return test
+
+        class Case(case.Case):
+
+            def test(self):
+                story.append('test')
+
+        for name in names:
+            setattr(Case, name, create_test(name))
+
+        suite_inst.register(Case)
+
+        program_inst = program.Program(exit=False, stream=StringIO())
+        program_inst.config.LAST_FAILED = last_failed
+        program_inst.config.FAILED_FIRST = not last_failed
+        program_inst.config.LAST_FAILED_CACHE = self.cache_path
+        program_inst.register_suite(suite_inst)
+
+        return program_inst()
+
+    def test_rerun(self):
+        self.assertFalse(self.run_program(fail=True))
+        self.assertEqual(
+            lastfailed.LastFailedCache(self.cache_path).commands(),
+            ['last_failed:Case.test_two'],
+        )
+
+        del self.story[:]
+        self.assertFalse(self.run_program(fail=True, last_failed=True))
+        self.assertEqual(self.story, ['test_two'])
+
+        del self.story[:]
+        self.assertTrue(self.run_program(fail=False, last_failed=True))
+        self.assertEqual(self.story, ['test_two'])
+        self.assertFalse(lastfailed.LastFailedCache(self.cache_path))
+
+        del self.story[:]
+        self.assertTrue(self.run_program(fail=False, last_failed=True))
+        self.assertEqual(sorted(self.story), ['test', 'test_two'])
+
+    def test_renamed_test(self):
+        self.assertFalse(
+            self.run_program(fail=True, names=('test_two', 'test_three')),
+        )
+
+        del self.story[:]
+        self.assertFalse(
+            self.run_program(fail=True, last_failed=True, names=('test_two', 'test_four')),
+        )
+        self.assertEqual(self.story, ['test_two'])
+        self.assertEqual(
+            lastfailed.LastFailedCache(self.cache_path).commands(),
+            ['last_failed:Case.test_two'],
+        )
@@ -1,12 +1,28 @@
 # -*- coding: utf-8 -*-
 
+import os
+import gc
+import json
+import shutil
 import inspect
+import weakref
+import tempfile
 
 from seismograph import (
     case,
+    merge,
+    binary,
     suite,
     steps,
+    result,
+    runnable,
+    xunit,
+    config,
+    timings,
+    schedule,
+    collector,
     exceptions,
+    extensions,
     SuiteLayer,
     CaseLayer,
 )
@@ -16,6 +32,7 @@ from .lib.factories import (
     case_factory,
     suite_factory,
     config_factory,
+    result_factory,
 )
 
 from .lib.case import (
@@ -612,6 +629,274 @@ class TestBuild(SuiteTestCaseMixin, BaseTestCase):
         self.assertIsInstance(boxes[0], self.suite.__case_box_class__)
         self.assertEqual(len(boxes[0]), 2)
 
+    def test_build_longest_first(self):
+        @self.suite.register
+        class CaseClass(case.Case):
+
+            def test(self):
+                pass
+
+        @self.suite.register
+        class CaseClass2(case.Case):
+
+            def test(self):
+                pass
+
+        runtimes = schedule.Runtimes(
+            cases={
+                '{}.CaseClass.test'.format(self.suite.name): 0.1,
+                '{}.CaseClass2.test'.format(self.suite.name): 1.0,
+            },
+        )
+        self.suite.build(shuffle=schedule.longest_first(runtimes))
+
+        names = [b.__class__.__name__ for c in self.suite for b in c]
+
+        self.assertEqual(names, ['CaseClass2', 'CaseClass'])
+
+    def test_runtimes_from_missing_file(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+
+        self.config.RUNTIMES_FROM = os.path.join(path, 'report.xml')
+
+        runtimes = collector.get_runtimes(self.config)
+
+        self.assertIsNone(runtimes)
+        self.assertIsNone(collector.get_order(self.config, runtimes=runtimes))
+        self.assertIs(collector.get_shard_weight(runtimes), schedule.count_weight)
+
+        with open(self.config.RUNTIMES_FROM, 'w') as fp:
+            fp.write('<testsuites><testsuite')
+
+        self.assertIsNone(schedule.load_runtimes(self.config.RUNTIMES_FROM))
+
+        with open(self.config.RUNTIMES_FROM, 'w') as fp:
+            fp.write('<testsuites><testsuite name="test" time="1.5"/></testsuites>')
+
+        self.assertEqual(
+            schedule.load_runtimes(self.config.RUNTIMES_FROM).suites, {'test': 1.5},
+        )
+
+    def test_build_failed_first(self):
+        @self.suite.register
+        class CaseClass(case.Case):
+
+            def test(self):
+                pass
+
+        @self.suite.register
+        class CaseClass2(case.Case):
+
+            def test(self):
+                pass
+
+        self.suite.build(
+            shuffle=schedule.failed_first(
+                {self.suite.name},
+                {'{}.CaseClass2.test'.format(self.suite.name)},
+            ),
+        )
+
+        names = [b.__class__.__name__ for c in self.suite for b in c]
+
+        self.assertEqual(names, ['CaseClass2', 'CaseClass'])
+
+    def test_split_cases(self):
+        @self.suite.register
+        class CaseClass(case.Case):
+
+            def test(self):
+                pass
+
+            def test_two(self):
+                pass
+
+            def test_three(self):
+                pass
+
+        @self.suite.register
+        class CaseClass2(case.Case):
+
+            def test(self):
+                pass
+
+        self.suite.build()
+
+        parts = self.suite.split_cases(2)
+
+        self.assertEqual(len(parts), 2)
+        self.assertEqual([len(b) for b in parts[0]], [2])
+        self.assertEqual([len(b) for b in parts[1]], [1, 1])
+
+        with self.suite.shard(1, 2):
+            self.assertEqual(len([c for b in self.suite for c in b]), 2)
+
+        self.assertEqual(len([c for b in self.suite for c in b]), 4)
+
+    def test_group_fixtures(self):
+        @self.suite.register
+        class CaseClass(case.Case):
+
+            def test(self):
+                pass
+
+            def test_two(self):
+                pass
+
+        @self.suite.register(require=['ext'])
+        class CaseClass2(case.Case):
+
+            def test(self):
+                pass
+
+        @self.suite.register
+        class CaseClass3(case.Case):
+
+            def test(self):
+                pass
+
+        for case_class, test_name in (
+                (CaseClass, 'test'),
+                (CaseClass2, 'test'),
+                (CaseClass3, 'test'),
+                (CaseClass, 'test_two'),
+        ):
+            self.suite.assign_build_rule(
+                suite.BuildRule(
+                    self.suite.name,
+                    case_name=case_class.__name__,
+                    test_name=test_name,
+                ),
+            )
+
+        extensions.set(object(), 'ext', is_data=True)
+        self.addCleanup(extensions.get_registry().pop, 'ext')
+
+        self.config.GROUP_FIXTURES = True
+        self.suite.build()
+
+        boxes = [b for b in self.suite]
+
+        self.assertEqual(
+            [[c.__class__.__name__ for c in b] for b in boxes],
+            [['CaseClass', 'CaseClass'], ['CaseClass3'], ['CaseClass2']],
+        )
+
+
+class TestShard(BaseTestCase):
+
+    def setUp(self):
+        self.config = config_factory.create(SHARD_COUNT=3)
+
+    def create_suites(self):
+        suites = []
+
+        for i in range(5):
+            suite_inst = suite.Suite('shard_{}'.format(i))
+            suite_inst.__mount_data__ = suite.MountData(self.config)
+
+            for j in range(i + 1):
+                suite_inst.register(
+                    type(
+                        'CaseClass{}'.format(j),
+                        (case.Case, ),
+                        {'test': lambda self: None, 'test_two': lambda self: None},
+                    ),
+                )
+
+            suite_inst.build()
+            suites.append(suite_inst)
+
+        return suites
+
+    def get_shards(self, shard):
+        shards = []
+
+        for index in range(self.config.SHARD_COUNT):
+            self.config.SHARD_INDEX = index
+            shards.append(shard(self.create_suites(), self.config))
+
+        return shards
+
+    def assert_disjoint(self, shards, expected):
+        items = [item for shard in shards for item in shard]
+
+        self.assertEqual(len(items), len(set(items)))
+        self.assertEqual(set(items), expected)
+
+    def test_partition(self):
+        items = list(range(10))
+        partitions = schedule.partition(
+            items, 3, weight=lambda i: i + 1, key=lambda i: i,
+        )
+        loads = [sum(i + 1 for i in p) for p in partitions]
+
+        self.assert_disjoint(partitions, set(items))
+        self.assertLessEqual(max(loads) - min(loads), 1)
+        self.assertEqual(
+            schedule.partition(
+                items[::-1], 3, weight=lambda i: i + 1, key=lambda i: i,
+            ),
+            partitions,
+        )
+
+    def test_shard_suites(self):
+        shards = self.get_shards(collector.shard_suites)
+
+        self.assert_disjoint(
+            [[s.name for s in shard] for shard in shards],
+            set('shard_{}'.format(i) for i in range(5)),
+        )
+        self.assertEqual(
+            [sorted(s.name for s in shard) for shard in shards],
+            [['shard_4'], ['shard_0', 'shard_3'], ['shard_1', 'shard_2']],
+        )
+
+    def test_shard_suites_by_runtime(self):
+        runtimes = schedule.Runtimes(
+            suites=dict(('shard_{}'.format(i), 1.0) for i in range(5)),
+        )
+        runtimes.suites['shard_0'] = 10.0
+
+        self.config.SHARD_INDEX = 0
+        shard = collector.shard_suites(
+            self.create_suites(), self.config, runtimes=runtimes,
+        )
+
+        self.assertEqual([s.name for s in shard], ['shard_0'])
+
+    def test_shard_cases(self):
+        shards = self.get_shards(collector.shard_cases)
+
+        self.assert_disjoint(
+            [
+                [schedule.case_key(c) for s in shard for b in s for c in b]
+                for shard in shards
+            ],
+            set(
+                schedule.case_key(c)
+                for s in self.create_suites() for b in s for c in b
+            ),
+        )
+        self.assertEqual(
+            [sum(len(b) for s in shard for b in s) for shard in shards],
+            [10, 10, 10],
+        )
+
+    def test_prepare_config(self):
+        for count, index in ((3, 3), (3, -1), (0, 0), (None, 0), (3, None)):
+            self.config.SHARD_COUNT = count
+            self.config.SHARD_INDEX = index
+
+            with self.assertRaises(exceptions.ConfigError):
+                config.prepare_config(self.config)
+
+        self.config.SHARD_INDEX = 2
+        self.config.SHARD_COUNT = 3
+
+        config.prepare_config(self.config)
+
 
 class TestRunSuite(RunSuiteTestCaseMixin, BaseTestCase):
 
@@ -691,3 +976,524 @@ class TestShouldStop(SuiteTestCaseMixin, ResultTestCaseMixin, BaseTestCase):
         self.assertFalse(self.result.failures)
         self.assertFalse(self.result.successes)
         self.assertEqual(self.result.current_state.tests, 0)
+
+
+class TestXUnitStream(RunSuiteTestCaseMixin, BaseTestCase):
+
+    def make_config(self):
+        super(TestXUnitStream, self).make_config()
+
+        self.config.XUNIT_STREAM = True
+        self.config.XUNIT_REPORT = os.path.join(tempfile.mkdtemp(), 'report.xml')
+
+    def tearDown(self):
+        os.remove(self.config.XUNIT_REPORT)
+        os.rmdir(os.path.dirname(self.config.XUNIT_REPORT))
+
+        super(TestXUnitStream, self).tearDown()
+
+    def runTest(self):
+        self.assertTrue(
+            os.path.getsize(self.config.XUNIT_REPORT + '.part') > 0,
+        )
+
+        self.result.__exit__(None, None, None)
+
+        document = xunit.create_xml_document(self.result)
+
+        if not isinstance(document, bytes):
+            document = document.encode('utf-8')
+
+        with open(self.config.XUNIT_REPORT, 'rb') as fp:
+            self.assertEqual(fp.read(), document)
+
+        self.assertFalse(
+            os.path.exists(self.config.XUNIT_REPORT + '.part'),
+        )
+
+
+class TestEvents(RunSuiteTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            pass
+
+        def test_two(self):
+            self.assertion.fail('fail')
+
+    def make_config(self):
+        super(TestEvents, self).make_config()
+
+        self.config.EVENTS = os.path.join(tempfile.mkdtemp(), 'events.jsonl')
+
+    def tearDown(self):
+        os.remove(self.config.EVENTS)
+        os.rmdir(os.path.dirname(self.config.EVENTS))
+
+        super(TestEvents, self).tearDown()
+
+    def runTest(self):
+        self.result.__exit__(None, None, None)
+
+        with open(self.config.EVENTS) as fp:
+            records = [json.loads(line) for line in fp]
+
+        self.assertEqual(
+            [r['event'] for r in records],
+            [
+                'suite_start',
+                'case_start', 'case_stop',
+                'case_start', 'case_stop',
+                'suite_stop',
+                'run_end',
+            ],
+        )
+        self.assertEqual(
+            [(r['method_name'], r['status']) for r in records if r['event'] == 'case_stop'],
+            [('test', 'success'), ('test_two', 'fail')],
+        )
+        self.assertEqual(records[-2]['tests'], 2)
+        self.assertEqual(records[-2]['failures'], 1)
+
+
+class TestBinaryResult(RunSuiteTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            pass
+
+        def test_two(self):
+            self.assertion.fail('fail')
+
+        def test_three(self):
+            raise ValueError('error')
+
+    def setUp(self):
+        super(TestBinaryResult, self).setUp()
+
+        self.file_path = os.path.join(tempfile.mkdtemp(), 'result.sgr')
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.file_path))
+
+        super(TestBinaryResult, self).tearDown()
+
+    def test_merge(self):
+        binary.write_result(self.result, self.file_path)
+
+        merged = merge.merge_results(
+            result_factory.create(self.config), [self.file_path, self.file_path],
+        )
+
+        self.assertEqual(len(merged.proxies), 1)
+        self.assertEqual(merged.current_state.tests, 6)
+        self.assertEqual(len(merged.proxies[0].failures), 2)
+        self.assertEqual(
+            merged.proxies[0].get_state().runtime,
+            self.result.proxies[0].get_state().runtime,
+        )
+
+        runnable_object, xunit_data = merged.errors[0]
+
+        self.assertEqual(runnable.stopped_on(runnable_object), 'test_three')
+        self.assertEqual(xunit_data.exc_message, 'error')
+
+        with open(self.file_path, 'wb') as fp:
+            fp.write(b'<?xml')
+
+        with self.assertRaises(exceptions.BinaryResultError):
+            binary.read_result(self.file_path)
+
+    def test_python_version(self):
+        python = 2 if pyv.IS_PYTHON_3 else 3
+
+        with open(self.file_path, 'wb') as fp:
+            fp.write(binary.MAGIC)
+            fp.write(binary.VERSIONS.pack(binary.FORMAT_VERSION, python))
+            fp.write(b'broken marshal data')
+
+        with self.assertRaises(exceptions.BinaryResultError) as ctx:
+            binary.read_result(self.file_path)
+
+        self.assertIn('python {}'.format(python), ctx.exception.message)
+
+    def test_stream_suites(self):
+        binary.write_result(self.result, self.file_path)
+
+        self.config.XUNIT_STREAM = True
+        self.config.XUNIT_REPORT = os.path.join(
+            os.path.dirname(self.file_path), 'report.xml',
+        )
+
+        merged = merge.merge_results(
+            result_factory.create(self.config), [self.file_path, self.file_path],
+        )
+
+        # suite is written before close of result
+        self.assertTrue(
+            os.path.getsize(self.config.XUNIT_REPORT + '.part') > 0,
+        )
+
+        merged.__exit__(None, None, None)
+
+        self.assertTrue(os.path.isfile(self.config.XUNIT_REPORT))
+        os.remove(self.config.XUNIT_REPORT)
+
+
+class TestTimingsStore(ResultTestCaseMixin, BaseTestCase):
+
+    def setUp(self):
+        super(TestTimingsStore, self).setUp()
+
+        self.path = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.path, 'timings.db')
+        self.store = timings.TimingsStore(self.file_path)
+
+        for runtime in (1.0, 2.0, 3.0):
+            self.save_result(runtime)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+        super(TestTimingsStore, self).tearDown()
+
+    def save_result(self, runtime):
+        self.make_result()
+
+        result_proxy = self.result.create_proxy(name='suite')
+        result_proxy.runtime = runtime * 3
+        result_proxy.successes.append(
+            (
+                case_factory.create(),
+                xunit.XUnitData(
+                    runtime=runtime,
+                    class_name='suite.Case',
+                    method_name='test',
+                    steps=[('step', runtime / 2)],
+                ),
+            ),
+        )
+        result_proxy.failures.append(
+            (
+                case_factory.create(),
+                xunit.XUnitData(
+                    runtime=runtime * 2,
+                    class_name='suite.Case',
+                    method_name='test_two',
+                ),
+            ),
+        )
+
+        self.result.extend(result_proxy)
+        self.result.proxies.append(result_proxy)
+
+        return self.store.save_result(self.result)
+
+    def test_save_result(self):
+        self.assertEqual(self.save_result(4.0), 4)
+        self.assertTrue(timings.is_timings_db(self.file_path))
+
+        self.assertEqual(
+            self.store.runtimes('suite.Case.test'), [4.0, 3.0, 2.0, 1.0],
+        )
+        self.assertEqual(
+            self.store.runtimes('suite.Case.test', last=2), [4.0, 3.0],
+        )
+        self.assertEqual(
+            self.store.runtimes('suite.Case.test.step', kind=timings.KIND_STEP),
+            [2.0, 1.5, 1.0, 0.5],
+        )
+        self.assertEqual(
+            self.store.runtimes('suite', kind=timings.KIND_SUITE),
+            [12.0, 9.0, 6.0, 3.0],
+        )
+        self.assertEqual(self.store.runtimes('unknown'), [])
+
+    def test_percentile(self):
+        self.assertEqual(self.store.percentile('suite.Case.test', 50), 2.0)
+        self.assertEqual(self.store.percentile('suite.Case.test', 25), 1.5)
+        self.assertEqual(self.store.percentile('suite.Case.test', 100), 3.0)
+        self.assertEqual(self.store.percentile('suite.Case.test', 50, last=2), 2.5)
+        self.assertIsNone(self.store.percentile('unknown', 50))
+
+    def test_trend(self):
+        trend = self.store.trend('suite.Case.test')
+
+        self.assertEqual([runtime for _, runtime in trend], [1.0, 2.0, 3.0])
+        self.assertEqual(
+            [started for started, _ in trend],
+            sorted(started for started, _ in trend),
+        )
+        self.assertEqual(
+            [runtime for _, runtime in self.store.trend('suite.Case.test', last=2)],
+            [2.0, 3.0],
+        )
+
+    def test_slowest(self):
+        self.assertEqual(
+            self.store.slowest(),
+            [('suite.Case.test_two', 6.0), ('suite.Case.test', 3.0)],
+        )
+        self.assertEqual(
+            self.store.slowest(count=1, last=3), [('suite.Case.test_two', 4.0)],
+        )
+
+    def test_load_runtimes(self):
+        runtimes = self.store.load_runtimes(last=2)
+
+        self.assertEqual(runtimes.suites, {'suite': 7.5})
+        self.assertEqual(
+            runtimes.cases, {'suite.Case.test': 2.5, 'suite.Case.test_two': 5.0},
+        )
+        self.assertEqual(
+            schedule.load_runtimes(self.file_path).cases,
+            {'suite.Case.test': 2.0, 'suite.Case.test_two': 4.0},
+        )
+
+
+class TestLazyCases(RunSuiteTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            pass
+
+        def test_two(self):
+            self.assertion.fail('fail')
+
+    def make_config(self):
+        super(TestLazyCases, self).make_config()
+
+        self.config.LAZY_CASES = True
+
+    def run_suite(self):
+        self.descriptors = [c for b in self.suite for c in b]
+
+        self.suite(self.result)
+
+    def runTest(self):
+        self.assertEqual(len(self.descriptors), 2)
+
+        for descriptor in self.descriptors:
+            self.assertIsInstance(descriptor, case.CaseDescriptor)
+
+        self.assertEqual(
+            [runnable.class_name(d) for d in self.descriptors],
+            [runnable.class_name(c) for c, _ in list(self.result.successes) + list(self.result.failures)],
+        )
+
+        runnable_object, _ = self.result.failures[0]
+
+        # materialized case is not kept alive by result
+        self.assertIsInstance(runnable_object, runnable.RunnableHandle)
+        self.assertEqual(runnable_object.id, self.descriptors[1].id)
+        self.assertEqual(runnable.stopped_on(runnable_object), 'test_two')
+        self.assertEqual(
+            [c for b in self.suite for c in b], self.descriptors,
+        )
+
+
+class TestLazyCasesRequire(SuiteTestCaseMixin, ResultTestCaseMixin, BaseTestCase):
+
+    def make_config(self):
+        super(TestLazyCasesRequire, self).make_config()
+
+        self.config.LAZY_CASES = True
+
+    def runTest(self):
+        values = []
+
+        @self.suite.register(require=['lazy_ext'])
+        class CaseClass(case.Case):
+
+            def test(self):
+                values.append(self.ext('lazy_ext'))
+
+        @self.suite.register(require=['not_found_ext'])
+        class CaseClass2(case.Case):
+
+            def test(self):
+                pass
+
+            def test_two(self):
+                pass
+
+        @self.suite.register
+        class CaseClass3(case.Case):
+
+            def test(self):
+                pass
+
+        extensions.set({'a': 1}, 'lazy_ext', is_data=True)
+        self.addCleanup(extensions.get_registry().pop, 'lazy_ext')
+
+        self.suite.build()
+        self.suite(self.result)
+
+        self.assertEqual(values, [{'a': 1}])
+        self.assertEqual(self.result.current_state.tests, 4)
+        self.assertEqual(self.result.current_state.successes, 2)
+        self.assertEqual(
+            [
+                (runnable.class_name(r), runnable.method_name(r), x.exc_type)
+                for r, x in self.result.errors
+            ],
+            [
+                ('{}.CaseClass2'.format(self.suite.name), 'test', 'seismograph.exceptions.ExtensionNotFound'),
+                ('{}.CaseClass2'.format(self.suite.name), 'test_two', 'seismograph.exceptions.ExtensionNotFound'),
+            ],
+        )
+
+
+class TestCompactResult(RunSuiteTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            pass
+
+        def test_two(self):
+            self.assertion.fail('fail')
+
+    def make_config(self):
+        super(TestCompactResult, self).make_config()
+
+        self.config.COMPACT_RESULT = True
+
+    def run_suite(self):
+        self.cases = [weakref.ref(c) for b in self.suite for c in b]
+
+        self.suite(self.result)
+
+    def runTest(self):
+        gc.collect()
+
+        self.assertEqual(self.result.current_state.tests, 2)
+
+        runnable_object, xunit_data = self.result.failures[0]
+
+        self.assertIsInstance(runnable_object, runnable.RunnableHandle)
+        self.assertEqual(runnable.stopped_on(runnable_object), 'test_two')
+        self.assertIs(self.result.get_fail_by(runnable_object), xunit_data)
+        self.assertEqual(
+            runnable.class_name(runnable_object), xunit_data.class_name,
+        )
+
+        self.assertEqual(len(self.cases), 2)
+        self.assertFalse([r for r in self.cases if r() is not None])
+
+
+class TestInternReason(RunSuiteTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {
+        'COMPACT_RESULT': True,
+        'REASON_SPILL_SIZE': 10,
+    }
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            self.assertion.fail(''.join(['fa', 'il']))
+
+        def test_two(self):
+            self.assertion.fail(''.join(['fa', 'il']))
+
+    def runTest(self):
+        (_, first), (_, second) = self.result.failures
+
+        self.assertEqual(first.exc_message, 'fail')
+        self.assertIs(first.exc_message, second.exc_message)
+        self.assertTrue(first.reason.is_spilled)
+
+
+class TestInternTable(BaseTestCase):
+
+    def runTest(self):
+        table = result.InternTable(size=1, max_length=5)
+        text = 'x' * 6
+
+        self.assertIs(table(''.join(['a', 'b'])), table(''.join(['a', 'b'])))
+        self.assertIs(table(text), text)
+        self.assertIs(table(None), None)
+        self.assertEqual(len(table), 1)
+
+        text = ''.join(['c', 'd'])
+
+        self.assertIs(table(text), text)
+        self.assertEqual(len(table), 1)
+
+
+class TestReleaseCases(RunSuiteTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        refs = []
+        alive = []
+
+        def check_alive(self):
+            self.refs.append(weakref.ref(self))
+            gc.collect()
+            self.alive.append(len([r for r in self.refs if r() is not None]))
+
+        def test(self):
+            self.check_alive()
+
+        def test_two(self):
+            self.check_alive()
+
+        def test_three(self):
+            self.check_alive()
+
+    def runTest(self):
+        for options in (dict(COMPACT_RESULT=True), dict(LAZY_CASES=True)):
+            del self.CaseClass.refs[:]
+            del self.CaseClass.alive[:]
+
+            for name, value in options.items():
+                setattr(self.config, name, value)
+
+            self.make_suite()
+            self.make_result()
+
+            self.suite.cases.append(self.CaseClass)
+            self.suite.build()
+            self.suite(self.result)
+
+            self.assertEqual(self.result.current_state.successes, 3)
+            self.assertEqual(self.CaseClass.alive, [1, 1, 1], options)
+
+            gc.collect()
+            self.assertFalse([r for r in self.CaseClass.refs if r() is not None])
+
+
+class TestBufferedConsole(RunSuiteTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            pass
+
+        def test_two(self):
+            self.assertion.fail('fail')
+
+    def make_config(self):
+        super(TestBufferedConsole, self).make_config()
+
+        self.config.NO_COLOR = True
+        self.config.BUFFERED_CONSOLE = True
+
+    def runTest(self):
+        writer = self.result.console.writer
+
+        self.assertIsNotNone(writer)
+        self.assertTrue(writer.is_alive)
+
+        writer.flush()
+        self.assertEqual(self.stream.getvalue(), u'.F')
+
+        self.result.final()
+
+        self.assertFalse(writer.is_alive)
+        self.assertIn(u'tests=2 failures=1', self.stream.getvalue())